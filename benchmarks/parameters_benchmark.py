@@ -0,0 +1,46 @@
+"""Compares the client-side cost of converting query parameters.
+
+Python lists are converted element by element into a general kdb+ list,
+while NumPy arrays and pandas Series are handed to pykx as typed vectors.
+No q server is needed: only the conversion performed before a query is
+sent is measured.
+
+Usage, from the repository root:
+    PYTHONPATH=. python benchmarks/parameters_benchmark.py [size] [repeat]
+"""
+from __future__ import annotations
+
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+import pykx
+
+from huunq.parameters import to_q_parameter
+
+
+def main() -> int:
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    array = np.arange(size, dtype=np.int64)
+    cases = {
+        "list": array.tolist(),
+        "numpy.ndarray": array,
+        "pandas.Series": pd.Series(array),
+        "pykx.LongVector": pykx.toq(array),
+    }
+    print(f"Converting {size:,} longs, best of {repeat} runs")
+    for name, value in cases.items():
+        if isinstance(value, list):
+            timer = timeit.Timer(lambda: pykx.toq(value))
+        else:
+            timer = timeit.Timer(lambda: to_q_parameter(value))
+        best = min(timer.repeat(repeat=repeat, number=1))
+        print(f"{name:>16}: {best * 1e3:10.3f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
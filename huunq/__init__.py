@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import logging
 
+from huunq.cache import ResultCache as ResultCache
 from huunq.connection import connect as connect
 from huunq.connection import Connection as Connection
 from huunq.cursor import Cursor as Cursor
@@ -15,9 +16,12 @@ from huunq.exceptions import NotSupportedError as NotSupportedError
 from huunq.exceptions import OperationalError as OperationalError
 from huunq.exceptions import ProgrammingError as ProgrammingError
 from huunq.exceptions import Warning as Warning
+from huunq.frames import read_frame as read_frame
 from huunq.globals import apilevel as apilevel
 from huunq.globals import paramstyle as paramstyle
 from huunq.globals import threadsafety as threadsafety
+from huunq.routing import connect_replicas as connect_replicas
+from huunq.routing import ReplicatedConnection as ReplicatedConnection
 
 logging.getLogger(__name__).addHandler(logging.NullHandler())
 
@@ -27,7 +31,9 @@ __all__ = (
     "threadsafety",
     "paramstyle",
     "connect",
+    "connect_replicas",
     "Connection",
+    "ReplicatedConnection",
     "Warning",
     "Error",
     "InterfaceError",
@@ -39,4 +45,6 @@ __all__ = (
     "ProgrammingError",
     "NotSupportedError",
     "Cursor",
+    "ResultCache",
+    "read_frame",
 )
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import collections
+import threading
+import time
+from typing import Any
+from typing import Callable
+from typing import Hashable
+from typing import Mapping
+from typing import NamedTuple
+from typing import Sequence
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+import pykx
+
+from huunq.sizing import estimate_rows_bytes
+from huunq.sizing import estimate_table_bytes
+from huunq.statements import referenced_tables
+from huunq.typing import Parameters
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    nbytes: int
+
+
+RowConverter = Callable[[pykx.Table], Sequence[Tuple[object, ...]]]
+
+
+class CacheEntry:
+    def __init__(
+        self,
+        table: pykx.Table,
+        to_rows: RowConverter,
+        tables: frozenset[str],
+        nbytes: int,
+        expires_at: float,
+    ) -> None:
+        """A cached result, converted to rows on first use.
+
+        Args:
+            table (pykx.Table): The result of the statement.
+            to_rows (RowConverter): Converts the result to rows.
+            tables (frozenset[str]): The tables the statement reads from.
+            nbytes (int): The estimated size of the result and its rows.
+            expires_at (float): When the entry expires, on the
+                `time.monotonic` clock.
+        """
+        self.table = table
+        self.tables = tables
+        self.nbytes = nbytes
+        self.expires_at = expires_at
+        self.__to_rows = to_rows
+        self.__rows: Sequence[tuple[object, ...]] | None = None
+        self.__lock = threading.Lock()
+
+    @property
+    def rows(self) -> Sequence[tuple[object, ...]]:
+        """The result converted to rows, which is done once for all the
+        cursors sharing the entry."""
+        with self.__lock:
+            if self.__rows is None:
+                self.__rows = self.__to_rows(self.table)
+            return self.__rows
+
+
+def _freeze(value: Any) -> Hashable:
+    """Converts a parameter value to a hashable equivalent.
+
+    Scalars are keyed by type as well, as 1, 1.0 and True are equal in
+    Python but are sent to kdb+ as a long, a float and a boolean. Arrays
+    of Python objects, such as strings, are keyed by their items, as their
+    buffers only hold the addresses of the items.
+    """
+    if isinstance(value, (pd.Series, pd.Index)):
+        value = value.to_numpy()
+    if isinstance(value, np.ndarray) and value.dtype.hasobject:
+        items = tuple(_freeze(item) for item in value.tolist())
+        return (value.dtype.str, value.shape, items)
+    if isinstance(value, np.ndarray):
+        return (value.dtype.str, value.shape, value.tobytes())
+    if isinstance(value, Mapping):
+        return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, pykx.K):
+        raise TypeError("pykx objects are not hashable")
+    hash(value)
+    return (type(value), value)
+
+
+class ResultCache:
+    def __init__(
+        self,
+        max_bytes: int = 64 * 2**20,
+        ttl: float = 60.0,
+        table_ttls: Mapping[str, float] | None = None,
+    ) -> None:
+        """Initializes a new instance of the ResultCache class.
+
+        The cache keeps the results of SELECT statements, keyed by statement
+        and parameters, along with their conversion to rows. Entries expire
+        after a time-to-live, and the least recently used entries are
+        evicted once the estimated size of the cache exceeds `max_bytes`.
+
+        Args:
+            max_bytes (int, optional): The maximum estimated size of the
+                cached results, in bytes. Defaults to 64 MiB.
+            ttl (float, optional): The time-to-live of an entry, in seconds.
+                Defaults to 60.0.
+            table_ttls (Mapping[str, float] | None, optional): Time-to-live
+                overrides by table name. An entry reading from several of
+                these tables expires with the shortest of their
+                time-to-lives. Defaults to None.
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.table_ttls = dict(table_ttls or {})
+        self.__entries: collections.OrderedDict[
+            Hashable, CacheEntry
+        ] = collections.OrderedDict()
+        self.__lock = threading.Lock()
+        self.__nbytes = 0
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+    @staticmethod
+    def make_key(
+        operation: str,
+        parameters: Parameters | None = None,
+        endpoint: Hashable = None,
+    ) -> Hashable | None:
+        """Builds the cache key of a statement and its parameters.
+
+        Args:
+            operation (str): The SQL operation.
+            parameters (Parameters | None, optional): The parameters of the
+                operation. Defaults to None.
+            endpoint (Hashable, optional): The server the statement is sent
+                to, so that a cache can be shared by connections to
+                different servers. Defaults to None.
+
+        Returns:
+            Hashable | None: The cache key, or None if the statement is not
+            a SELECT statement or its parameters cannot be hashed.
+        """
+        if not operation.lstrip().upper().startswith("SELECT"):
+            return None
+        try:
+            return (endpoint, operation, _freeze(parameters))
+        except TypeError:
+            return None
+
+    @property
+    def stats(self) -> CacheStats:
+        """The hit, miss and eviction counts and the current size
+        of the cache."""
+        with self.__lock:
+            return CacheStats(
+                hits=self.__hits,
+                misses=self.__misses,
+                evictions=self.__evictions,
+                entries=len(self.__entries),
+                nbytes=self.__nbytes,
+            )
+
+    def __remove(self, key: Hashable) -> None:
+        entry = self.__entries.pop(key)
+        self.__nbytes -= entry.nbytes
+
+    def get(self, key: Hashable) -> CacheEntry | None:
+        """Looks up a live entry and marks it as the most recently used.
+
+        Args:
+            key (Hashable): The cache key, see `make_key`.
+
+        Returns:
+            CacheEntry | None: The entry, or None on a cache miss.
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and entry.expires_at <= time.monotonic():
+                self.__remove(key)
+                entry = None
+            if entry is None:
+                self.__misses += 1
+                return None
+            self.__entries.move_to_end(key)
+            self.__hits += 1
+            return entry
+
+    def put(
+        self,
+        key: Hashable,
+        operation: str,
+        table: pykx.Table,
+        to_rows: RowConverter,
+    ) -> None:
+        """Stores the result of a statement.
+
+        Results larger than `max_bytes`, counting their estimated size once
+        converted to rows, are not stored. The rows are only converted when
+        a cache hit fetches them.
+
+        Args:
+            key (Hashable): The cache key, see `make_key`.
+            operation (str): The SQL operation that produced the result.
+            table (pykx.Table): The result of the operation.
+            to_rows (RowConverter): Converts the result to rows.
+        """
+        nbytes = estimate_table_bytes(table) + estimate_rows_bytes(table)
+        if nbytes > self.max_bytes:
+            return
+        tables = referenced_tables(operation)
+        ttl = min(
+            (
+                self.table_ttls[name]
+                for name in tables
+                if name in self.table_ttls
+            ),
+            default=self.ttl,
+        )
+        entry = CacheEntry(
+            table, to_rows, tables, nbytes, time.monotonic() + ttl
+        )
+        with self.__lock:
+            if key in self.__entries:
+                self.__remove(key)
+            self.__entries[key] = entry
+            self.__nbytes += nbytes
+            while self.__nbytes > self.max_bytes:
+                self.__remove(next(iter(self.__entries)))
+                self.__evictions += 1
+
+    def invalidate(self, table: str | None = None) -> int:
+        """Removes the entries reading from a table, or all the entries.
+
+        Args:
+            table (str | None, optional): The name of the table. If None,
+                the whole cache is cleared. Defaults to None.
+
+        Returns:
+            int: The number of removed entries.
+        """
+        with self.__lock:
+            keys = [
+                key
+                for key, entry in self.__entries.items()
+                if table is None or table in entry.tables
+            ]
+            for key in keys:
+                self.__remove(key)
+            return len(keys)
@@ -3,11 +3,14 @@ from __future__ import annotations
 from multiprocessing.synchronize import Lock as ProcessLock
 from threading import Lock as ThreadLock
 from types import TracebackType
+from typing import Any
 
 from pykx import SyncQConnection
 
+from huunq.cache import ResultCache
 from huunq.cursor import Cursor
 from huunq.exceptions import NotSupportedError
+from huunq.typing import QConnection
 
 
 class Connection:
@@ -25,22 +28,36 @@ class Connection:
         wait: bool = True,
         lock: ThreadLock | ProcessLock | None = None,
         no_ctx: bool = False,
+        cache: ResultCache | None = None,
     ) -> None:
         self.host = host
         self.port = port
         self.username = username
-        self.q_connection = SyncQConnection(
-            host=host,
-            port=port,
-            username=username,
-            password=password,
-            timeout=timeout,
-            large_messages=large_messages,
-            tls=tls,
-            unix=unix,
-            wait=wait,
-            lock=lock,
-            no_ctx=no_ctx,
+        self.cache = cache
+        self.__options: dict[str, Any] = {
+            "username": username,
+            "password": password,
+            "timeout": timeout,
+            "large_messages": large_messages,
+            "tls": tls,
+            "unix": unix,
+            "wait": wait,
+            "no_ctx": no_ctx,
+        }
+        self.q_connection: QConnection = self._connect(lock)
+
+    def _connect(self, lock: ThreadLock | ProcessLock | None) -> QConnection:
+        """Opens the underlying q connection.
+
+        Without an explicit lock, each connection gets its own, so that it
+        can be shared between threads: their requests then take turns on the
+        connection's socket.
+        """
+        return SyncQConnection(  # type: ignore[no-any-return]
+            host=self.host,
+            port=self.port,
+            lock=ThreadLock() if lock is None else lock,
+            **self.__options,
         )
 
     def __enter__(self) -> Connection:
@@ -71,6 +88,15 @@ class Connection:
     def cursor(self) -> Cursor:
         return Cursor(self)
 
+    def clone(self) -> Connection:
+        """
+        Opens a new connection to the same server, with the same options.
+
+        Returns:
+            Connection: The new connection object.
+        """
+        return Connection(self.host, self.port, **self.__options)
+
 
 def connect(
     host: str | bytes = "localhost",
@@ -84,6 +110,7 @@ def connect(
     unix: bool = False,
     wait: bool = True,
     no_ctx: bool = False,
+    cache: ResultCache | None = None,
 ) -> Connection:
     """
     Connects to a remote server using the specified parameters.
@@ -117,6 +144,10 @@ def connect(
             the context interface will be disabled. disabling the context
             interface will stop extra q queries being sent but will disable
             the extra features around the context interface. Defaults to False.
+        cache (ResultCache | None, optional): The cache in which the results
+            of SELECT statements are kept, to serve repeated statements
+            without contacting the server. The results are not cached
+            if None. Defaults to None.
 
     Returns:
         Connection: The connection object.
@@ -132,4 +163,5 @@ def connect(
         unix=unix,
         wait=wait,
         no_ctx=no_ctx,
+        cache=cache,
     )
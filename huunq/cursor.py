@@ -1,19 +1,33 @@
 from __future__ import annotations
 
+from typing import Any
 from typing import cast
+from typing import Generator
+from typing import Iterator
 from typing import Sequence
 from typing import TYPE_CHECKING
 
+import pandas as pd
 import pykx
 import sqlparams
 
 import huunq.globals
+from huunq import streaming
 from huunq.exceptions import NotSupportedError
+from huunq.exceptions import OperationalError
+from huunq.exceptions import ProgrammingError
+from huunq.parameters import to_q_parameter
+from huunq.partitioning import iter_partitions
+from huunq.sizing import estimate_table_bytes
+from huunq.statements import add_predicate
+from huunq.statements import split_statements
 from huunq.typing import Description
+from huunq.typing import LimitAction
 from huunq.typing import Parameters
 from huunq.utilities import error_if_closed
 
 if TYPE_CHECKING:
+    from huunq.cache import CacheEntry
     from huunq.connection import Connection
 
 
@@ -26,17 +40,40 @@ class Cursor:
 
         Attributes:
             arraysize (int): The number of rows to fetch at a time.
+            max_rows (int | None): The maximum number of rows a query may
+                return, or None for no limit. Applies to `execute` and
+                `executescript`; `execute_partitioned` does not support it.
+            max_result_bytes (int | None): The maximum estimated size of the
+                result of a query, in bytes, or None for no limit, like
+                `max_rows`.
+            on_limit (LimitAction): What to do with results over `max_rows`
+                or `max_result_bytes`: "raise" an OperationalError before
+                transferring them, or "stream" them in batches.
+            fetch_bytes (int): The maximum estimated size of a streamed batch,
+                in bytes.
+            fetch_latency (float): The target time to fetch a streamed batch,
+                in seconds. Batches are made smaller while they take longer.
         """
 
         self.__connection = connection
         self.__is_closed = False
         self.__result_set: pykx.Table | None = None
+        self.__next_result_sets: list[pykx.Table] = []
+        self.__chunks: Generator[pykx.Table, None, None] | None = None
+        self.__cached: CacheEntry | None = None
+        self.__rowcount: int = -1
         self.__cursor_position: int = 0
         self.__sqlparams = sqlparams.SQLParams(
             in_style=huunq.globals.paramstyle,
             out_style="numeric_dollar",
         )
         self.arraysize: int = 1
+        self.max_rows: int | None = None
+        self.max_result_bytes: int | None = None
+        self.on_limit: LimitAction = "raise"
+        self.fetch_bytes: int = 8 * 2**20
+        self.fetch_latency: float = 0.5
+        self.__estimated_bytes: int | None = None
 
     @property
     def result_set(self) -> pykx.Table | None:
@@ -55,11 +92,18 @@ class Cursor:
 
     @property
     def rowcount(self) -> int:
-        """The number of rows affected by the last query executed."""
+        """The number of rows affected by the last query executed, or -1
+        while it is not known yet."""
         if self.result_set is None:
             return -1
         else:
-            return len(self.result_set)
+            return self.__rowcount
+
+    @property
+    def estimated_bytes(self) -> int | None:
+        """The estimated size of the result of the last query executed, in
+        bytes. Only available when `max_rows` or `max_result_bytes` is set."""
+        return self.__estimated_bytes
 
     @property
     def connection(self) -> Connection:
@@ -74,8 +118,76 @@ class Cursor:
     def close(self) -> None:
         """Closes the cursor."""
         self.__is_closed = True
-        self.__result_set = None
+        self.__set_result_set(None)
+        self.__next_result_sets = []
+
+    def __set_result_set(
+        self,
+        result_set: pykx.Table | None,
+        chunks: Generator[pykx.Table, None, None] | None = None,
+        cached: CacheEntry | None = None,
+        rowcount: int | None = None,
+    ) -> None:
+        """Replaces the current result set.
+
+        A result set can be delivered in several chunks: `result_set` is then
+        its first chunk and `chunks` yields the following ones, and the total
+        `rowcount` is known once all of them are received, unless specified.
+        If the result set comes from the result cache, `cached` is its entry,
+        whose rows are shared with the other cursors.
+        """
+        if self.__chunks is not None:
+            self.__chunks.close()
+        self.__result_set = result_set
+        self.__chunks = chunks
+        self.__cached = cached
+        self.__received = 0 if result_set is None else len(result_set)
+        if rowcount is not None:
+            self.__rowcount = rowcount
+        elif result_set is None or chunks is not None:
+            self.__rowcount = -1
+        else:
+            self.__rowcount = len(result_set)
+        self.__cursor_position = 0
+
+    def __next_chunk(self) -> bool:
+        """Moves to the next chunk of the current result set, if any."""
+        if self.__chunks is None:
+            return False
+        chunk = next(self.__chunks, None)
+        if chunk is None:
+            self.__chunks = None
+            if self.__rowcount == -1:
+                self.__rowcount = self.__received
+            return False
+        self.__result_set = chunk
+        self.__received += len(chunk)
         self.__cursor_position = 0
+        return True
+
+    def __fetch(self, size: int | None) -> list[tuple[object, ...]]:
+        """Fetches up to `size` rows, or all the remaining rows if `size`
+        is None, across the chunks of the current result set."""
+        rows: list[tuple[object, ...]] = []
+        while self.result_set is not None:
+            stop = len(self.result_set)
+            if size is not None:
+                stop = min(stop, self.__cursor_position + size - len(rows))
+            if stop > self.__cursor_position and self.__cached is not None:
+                rows.extend(self.__cached.rows[self.__cursor_position : stop])
+                self.__cursor_position = stop
+            elif stop > self.__cursor_position:
+                selection = cast(
+                    pykx.Table,
+                    self.result_set[self.__cursor_position : stop],
+                )
+                rows.extend(self.table_to_rows(selection))
+                self.__cursor_position = stop
+            if size is not None and len(rows) >= size:
+                break
+            if not self.__next_chunk():
+                break
+        return rows
 
     @error_if_closed
     def execute(
@@ -83,21 +195,242 @@ class Cursor:
     ) -> None:
         """Executes the specified SQL operation on the database connection.
 
+        If the connection has a result cache, SELECT statements are served
+        from it when possible, without contacting the server. `max_rows` and
+        `max_result_bytes` apply to cached results as well.
+
         Args:
             operation (str): The SQL operation to execute.
             parameters (Parameters | None, optional): The parameters to be used
+            in the SQL operation. NumPy arrays, pandas Series and pykx
+            vectors are sent as typed kdb+ vectors, see `to_q_parameter`.
+            Defaults to None.
+        """
+        self.__next_result_sets = []
+        self.__estimated_bytes = None
+        cache = self.connection.cache
+        key = None
+        if cache is not None:
+            endpoint = (self.connection.host, self.connection.port)
+            key = cache.make_key(operation, parameters, endpoint)
+        if cache is not None and key is not None:
+            entry = cache.get(key)
+            if entry is not None:
+                self.__set_cached(entry)
+                return
+
+        query, arguments = operation, []
+        if parameters is not None:
+            query, formatted = self.__sqlparams.format(operation, parameters)
+            arguments = [*map(to_q_parameter, formatted)]
+        if self.__limited:
+            result_set = self.__execute_limited(query, arguments)
+            if result_set is None:
+                return
+        else:
+            result_set = self.connection.q_connection.sql(query, *arguments)
+
+        if cache is not None and key is not None:
+            cache.put(key, operation, result_set, self.table_to_rows)
+        self.__set_result_set(result_set)
+
+    @property
+    def __limited(self) -> bool:
+        return self.max_rows is not None or self.max_result_bytes is not None
+
+    def __within_limits(self, rows: int, nbytes: int) -> bool:
+        return (self.max_rows is None or rows <= self.max_rows) and (
+            self.max_result_bytes is None or nbytes <= self.max_result_bytes
+        )
+
+    def __limit_error(self, rows: int, nbytes: int) -> OperationalError:
+        return OperationalError(
+            f"The result has {rows} rows and an estimated size of "
+            f"{nbytes} bytes, over the limits of max_rows="
+            f"{self.max_rows} and max_result_bytes={self.max_result_bytes}"
+        )
+
+    def __set_cached(self, entry: CacheEntry) -> None:
+        """Serves a result from the result cache, under `max_rows` and
+        `max_result_bytes`.
+
+        A cached result over the limits is not sent again, so with
+        `on_limit="stream"` it is served without converting all its rows
+        at once.
+        """
+        if self.__limited:
+            rows = len(entry.table)
+            nbytes = estimate_table_bytes(entry.table)
+            self.__estimated_bytes = nbytes
+            if not self.__within_limits(rows, nbytes):
+                if self.on_limit != "stream":
+                    raise self.__limit_error(rows, nbytes)
+                self.__set_result_set(entry.table)
+                return
+        self.__set_result_set(entry.table, cached=entry)
+
+    def __execute_limited(
+        self, operation: str, parameters: Sequence[Any]
+    ) -> pykx.Table | None:
+        """Executes an operation under `max_rows` and `max_result_bytes`,
+        checking the estimated size of its result before transferring it.
+
+        Returns the result if it is within the limits, or None if it is
+        streamed in batches.
+        """
+        stream = self.on_limit == "stream"
+        q_connection = self.connection.q_connection
+        if stream and not streaming.supports_streaming(q_connection):
+            raise NotSupportedError(
+                "Results cannot be streamed from replicated connections"
+            )
+        staged = streaming.execute(
+            q_connection,
+            operation,
+            parameters,
+            max_rows=self.max_rows,
+            max_bytes=self.max_result_bytes,
+            stream=stream,
+        )
+        if staged.rows >= 0:
+            self.__estimated_bytes = staged.nbytes
+        if staged.complete:
+            return staged.table
+        if stream:
+            sizer = streaming.BatchSizer(
+                staged.nbytes // staged.rows,
+                self.fetch_bytes,
+                self.fetch_latency,
+            )
+            self.__set_result_set(
+                staged.table,
+                streaming.iter_batches(q_connection, staged, sizer),
+                rowcount=staged.rows,
+            )
+            return None
+        raise self.__limit_error(staged.rows, staged.nbytes)
+
+    @error_if_closed
+    def execute_partitioned(
+        self,
+        operation: str,
+        parameters: Parameters | None = None,
+        *,
+        partition_column: str,
+        ranges: Sequence[tuple[Any, Any]],
+        connections: int = 4,
+    ) -> None:
+        """Executes a SELECT statement as one query per range of
+        `partition_column`, run concurrently over several connections.
+
+        Each query is restricted with `lower <= partition_column < upper`,
+        prepended to its WHERE clause so that q only reads the matching
+        partitions. The results are streamed back in the order of `ranges`:
+        this method returns as soon as the first range is available, and the
+        fetch methods wait for the following ranges as needed. Clauses such
+        as LIMIT or GROUP BY apply to each range separately.
+
+        Args:
+            operation (str): The SELECT statement to execute.
+            parameters (Parameters | None, optional): The parameters to be used
             in the SQL operation. Defaults to None.
+            partition_column (str): The column to split the statement on,
+            typically `date` for a date-partitioned database.
+            ranges (Sequence[tuple[Any, Any]]): The `(lower, upper)` bounds of
+            each range, lower inclusive and upper exclusive.
+            connections (int, optional): The maximum number of connections to
+            run the queries over. Defaults to 4.
+
+        Raises:
+            ProgrammingError: If no range is given, or if the operation is not
+            a single SELECT statement.
+            NotSupportedError: If `max_rows` or `max_result_bytes` is set.
         """
+        if self.__limited:
+            raise NotSupportedError(
+                "Result size limits are not supported for partitioned "
+                "queries"
+            )
+        if not ranges:
+            raise ProgrammingError("At least one range must be specified.")
+        formatted: Sequence[Any] = []
         if parameters is not None:
-            operation, parameters = self.__sqlparams.format(
+            operation, formatted = self.__sqlparams.format(
                 operation, parameters
             )
-            self.__result_set = self.connection.q_connection.sql(
-                operation, *parameters
+            formatted = [*map(to_q_parameter, formatted)]
+        lower, upper = len(formatted) + 1, len(formatted) + 2
+        operation = add_predicate(
+            operation,
+            f"{partition_column} >= ${lower} AND "
+            f"{partition_column} < ${upper}",
+        )
+        chunks = iter_partitions(
+            self.connection, operation, formatted, ranges, connections
+        )
+        self.__set_result_set(next(chunks), chunks)
+        self.__next_result_sets = []
+
+    @error_if_closed
+    def executescript(self, script: str) -> None:
+        """Executes several SQL statements in a single round trip.
+
+        All the statements of the script are sent to the server in one
+        message and run there one after the other. The cursor is then
+        positioned on the result of the first statement, and `nextset`
+        moves to the results of the following ones.
+
+        With `max_rows` or `max_result_bytes` set, every statement is still
+        run, but no result is transferred if one of them is over the limits.
+
+        Args:
+            script (str): The SQL statements to execute, separated
+            by semicolons.
+
+        Raises:
+            OperationalError: If the result of a statement is over
+                `max_rows` or `max_result_bytes`.
+            NotSupportedError: If `on_limit` is "stream" while a limit is set.
+        """
+        statements = split_statements(script)
+        result_sets: list[pykx.Table] = []
+        if statements and self.__limited:
+            if self.on_limit == "stream":
+                raise NotSupportedError(
+                    "Results of scripts cannot be streamed"
+                )
+            staged = streaming.execute_script(
+                self.connection.q_connection,
+                statements,
+                max_rows=self.max_rows,
+                max_bytes=self.max_result_bytes,
+            )
+            for result in staged:
+                if not result.complete:
+                    raise self.__limit_error(result.rows, result.nbytes)
+            result_sets = [result.table for result in staged]
+        elif statements:
+            results = self.connection.q_connection(
+                "{.s.sp[;()] each x}",
+                [pykx.CharVector(statement) for statement in statements],
             )
-        else:
-            self.__result_set = self.connection.q_connection.sql(operation)
-        self.__cursor_position = 0
+            result_sets = [cast(pykx.Table, result) for result in results]
+        self.__set_result_set(result_sets[0] if result_sets else None)
+        self.__next_result_sets = result_sets[1:]
+
+    @error_if_closed
+    def nextset(self) -> bool | None:
+        """
+        Skips to the next result set of the last `executescript` call.
+
+        Returns:
+            bool | None: True if the cursor moved to the next result set,
+            or None if there are no more result sets.
+        """
+        if not self.__next_result_sets:
+            return None
+        self.__set_result_set(self.__next_result_sets.pop(0))
+        return True
 
     @error_if_closed
     def executemany(
@@ -129,14 +462,8 @@ class Cursor:
             tuple[object, ...] | None: The next row from the result set as a
             tuple of objects, or None if there are no more rows.
         """
-        if self.result_set is None:
-            return None
-        if self.__cursor_position >= len(self.result_set):
-            return None
-        selection = cast(pykx.Table, self.result_set[self.__cursor_position])
-        result = self.table_to_rows(selection)
-        self.__cursor_position += 1
-        return result[0]
+        result = self.__fetch(1)
+        return result[0] if result else None
 
     @error_if_closed
     def fetchmany(
@@ -154,20 +481,9 @@ class Cursor:
             Sequence[tuple[object, ...]]: A sequence of tuples representing
             the fetched rows.
         """
-        if self.result_set is None:
-            return []
         if size is None:
             size = self.arraysize
-
-        selection = cast(
-            pykx.Table,
-            self.result_set[
-                self.__cursor_position : self.__cursor_position + size
-            ],
-        )
-        result = self.table_to_rows(selection)
-        self.__cursor_position += len(result)
-        return result
+        return self.__fetch(size)
 
     @error_if_closed
     def fetchall(self) -> Sequence[tuple[object, ...]]:
@@ -178,12 +494,45 @@ class Cursor:
             Sequence[tuple[object, ...]]: A sequence of tuples representing
             the fetched rows.
         """
-        if self.result_set is None:
-            return []
-        selection = cast(pykx.Table, self.result_set[self.__cursor_position :])
-        result = self.table_to_rows(selection)
-        self.__cursor_position += len(selection)
-        return result
+        return self.__fetch(None)
+
+    @error_if_closed
+    def fetchtables(self, size: int | None = None) -> Iterator[pykx.Table]:
+        """
+        Fetches the remaining rows as pykx tables, without converting them
+        to Python objects.
+
+        Args:
+            size (int | None, optional): The maximum number of rows of each
+            table. If not specified, one table is returned for each chunk
+            the result set was received in.
+
+        Raises:
+            ProgrammingError: If `size` is not positive.
+
+        Yields:
+            pykx.Table: The next rows of the result set.
+        """
+        if size is not None and size <= 0:
+            raise ProgrammingError("size must be a positive integer.")
+        while self.result_set is not None:
+            stop = len(self.result_set)
+            if size is not None:
+                stop = min(stop, self.__cursor_position + size)
+            if stop > self.__cursor_position:
+                if self.__cursor_position == 0 and stop == len(
+                    self.result_set
+                ):
+                    table = self.result_set
+                else:
+                    table = cast(
+                        pykx.Table,
+                        self.result_set[self.__cursor_position : stop],
+                    )
+                self.__cursor_position = stop
+                yield table
+            elif not self.__next_chunk():
+                break
 
     def setinputsizes(self, sizes: Sequence[int]) -> None:
         """
@@ -210,8 +559,34 @@ class Cursor:
         raise NotSupportedError("setoutputsize() is not a supported operation")
 
     @staticmethod
-    def table_to_rows(table: pykx.Table) -> Sequence[tuple[object, ...]]:
-        """Converts a pykx.Table object to a sequence of tuples.
+    def table_to_frame(table: pykx.Table) -> pd.DataFrame:
+        """Converts a pykx.Table object to a pandas DataFrame.
+
+        Args:
+            table (pykx.Table): The table to convert.
+
+        Returns:
+            pd.DataFrame: The DataFrame holding the table.
+        """
+        return table.pd()
+
+    @staticmethod
+    def frame_to_rows(frame: pd.DataFrame) -> Sequence[tuple[object, ...]]:
+        """Converts a pandas DataFrame to a sequence of tuples.
+
+        Args:
+            frame (pd.DataFrame): The DataFrame to convert.
+
+        Returns:
+            Sequence[tuple[object, ...]]: A sequence of tuples representing
+            the rows of the DataFrame.
+        """
+        return [*frame.itertuples(index=False, name=None)]
+
+    @classmethod
+    def table_to_rows(cls, table: pykx.Table) -> Sequence[tuple[object, ...]]:
+        """Converts a pykx.Table object to a sequence of tuples, see
+        `table_to_frame` and `frame_to_rows`.
 
         Args:
             table (pykx.Table): The table to convert.
@@ -220,4 +595,4 @@ class Cursor:
             Sequence[tuple[object, ...]]: A sequence of tuples representing
             the table.
         """
-        return [*table.pd().itertuples(index=False, name=None)]
+        return cls.frame_to_rows(cls.table_to_frame(table))
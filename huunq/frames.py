@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from typing import Any
+from typing import Callable
+from typing import Iterator
+from typing import overload
+from typing import TYPE_CHECKING
+
+import pandas as pd
+import pykx
+
+from huunq.exceptions import ProgrammingError
+from huunq.streaming import supports_streaming
+from huunq.typing import FrameEngine
+from huunq.typing import Parameters
+
+if TYPE_CHECKING:
+    from huunq.connection import Connection
+
+
+def _pandas_converter() -> Callable[[pykx.Table], Any]:
+    return lambda table: table.pd()
+
+
+def _polars_converter() -> Callable[[pykx.Table], Any]:
+    try:
+        import polars as pl
+    except ImportError as e:  # pragma: no cover
+        raise ImportError(
+            "polars and pyarrow are required to read polars DataFrames, "
+            "install them with `pip install huunq[polars]`"
+        ) from e
+    return lambda table: pl.from_arrow(table.pa())
+
+
+def _concat(engine: FrameEngine, frames: list[Any]) -> Any:
+    if len(frames) == 1:
+        return frames[0]
+    if engine == "polars":
+        import polars as pl
+
+        return pl.concat(frames)
+    return pd.concat(frames, ignore_index=True)
+
+
+def _iter_frames(
+    connection: Connection,
+    operation: str,
+    parameters: Parameters | None,
+    to_frame: Callable[[pykx.Table], Any],
+    chunksize: int | None,
+) -> Iterator[Any]:
+    cursor = connection.cursor()
+    if chunksize is not None and supports_streaming(connection.q_connection):
+        # Results larger than a chunk stay on the server and are fetched
+        # in batches, instead of being received whole.
+        cursor.max_rows = chunksize
+        cursor.on_limit = "stream"
+    try:
+        cursor.execute(operation, parameters)
+        empty = True
+        for table in cursor.fetchtables(chunksize):
+            empty = False
+            yield to_frame(table)
+        if empty and cursor.result_set is not None:
+            # Keep the columns of an empty result.
+            yield to_frame(cursor.result_set)
+    finally:
+        cursor.close()
+
+
+@overload
+def read_frame(
+    connection: Connection,
+    operation: str,
+    parameters: Parameters | None = None,
+    *,
+    engine: FrameEngine = "pandas",
+    chunksize: None = None,
+) -> Any:
+    ...
+
+
+@overload
+def read_frame(
+    connection: Connection,
+    operation: str,
+    parameters: Parameters | None = None,
+    *,
+    engine: FrameEngine = "pandas",
+    chunksize: int,
+) -> Iterator[Any]:
+    ...
+
+
+def read_frame(
+    connection: Connection,
+    operation: str,
+    parameters: Parameters | None = None,
+    *,
+    engine: FrameEngine = "pandas",
+    chunksize: int | None = None,
+) -> Any:
+    """
+    Executes a SQL operation and reads its result as a DataFrame.
+
+    The kdb+ table received from the server is converted to a DataFrame
+    directly, without going through Python rows.
+
+    Args:
+        connection (Connection): The connection to execute the operation on.
+        operation (str): The SQL operation to execute.
+        parameters (Parameters | None, optional): The parameters to be used
+            in the SQL operation. Defaults to None.
+        engine (FrameEngine, optional): The DataFrame library to use, either
+            "pandas" or "polars". Defaults to "pandas".
+        chunksize (int | None, optional): If specified, the result is read
+            incrementally as DataFrames of at most `chunksize` rows. Results
+            larger than a chunk are kept on the server and received in
+            batches of about `Cursor.fetch_bytes`, so that only one batch
+            is held and one chunk converted at a time. On replicated
+            connections, the whole result is received first.
+            Defaults to None.
+
+    Raises:
+        ProgrammingError: If the engine is not supported or `chunksize`
+            is not positive.
+
+    Returns:
+        pandas.DataFrame | polars.DataFrame | Iterator[DataFrame]: The result
+        of the operation, or an iterator over its chunks if `chunksize` is
+        specified.
+    """
+    if engine == "pandas":
+        to_frame = _pandas_converter()
+    elif engine == "polars":
+        to_frame = _polars_converter()
+    else:
+        raise ProgrammingError(f"Unsupported DataFrame engine: {engine!r}")
+    if chunksize is not None and chunksize <= 0:
+        raise ProgrammingError("chunksize must be a positive integer.")
+
+    frames = _iter_frames(
+        connection, operation, parameters, to_frame, chunksize
+    )
+    if chunksize is not None:
+        return frames
+    return _concat(engine, list(frames))
@@ -7,5 +7,7 @@ from huunq.typing import ParamStyle
 from huunq.typing import ThreadSafety
 
 apilevel: Final[APILevel] = "2.0"
-threadsafety: Final[ThreadSafety] = 1
+# Threads may share connections because each connection serializes its
+# requests behind its own lock; requests are not pipelined.
+threadsafety: Final[ThreadSafety] = 2
 paramstyle: ParamStyle = "numeric"
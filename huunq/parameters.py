@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import pykx
+
+from huunq.exceptions import ProgrammingError
+
+
+def to_q_parameter(value: Any) -> Any:
+    """Converts a query parameter to its kdb+ representation.
+
+    NumPy arrays, pandas Series/Index and pykx objects are sent as typed
+    kdb+ vectors without any element-wise Python conversion: numeric and
+    temporal arrays are handed to pykx as contiguous buffers, timezone-aware
+    datetimes are converted to UTC first, and pykx objects are forwarded
+    untouched. Any other value is returned as is and left for pykx to
+    convert.
+
+    | NumPy / pandas dtype | kdb+ type               |
+    |----------------------|-------------------------|
+    | `bool`               | boolean (`b`)           |
+    | `uint8`              | byte (`x`)              |
+    | `int16`              | short (`h`)             |
+    | `int32`              | int (`i`)               |
+    | `int64`              | long (`j`)              |
+    | `float32`            | real (`e`)              |
+    | `float64`            | float (`f`)             |
+    | `datetime64[ns]`     | timestamp (`p`)         |
+    | `datetime64[ns, tz]` | timestamp (`p`), in UTC |
+    | `datetime64[D]`      | date (`d`)              |
+    | `timedelta64[ns]`    | timespan (`n`)          |
+    | `object` (str)       | symbol (`s`)            |
+
+    Args:
+        value (Any): The parameter to convert.
+
+    Raises:
+        ProgrammingError: If the value is an array with more than
+            one dimension.
+
+    Returns:
+        Any: The converted parameter.
+    """
+    if isinstance(value, pykx.K):
+        return value
+    if isinstance(value, (pd.Series, pd.Index)):
+        if isinstance(value.dtype, pd.DatetimeTZDtype):
+            value = pd.DatetimeIndex(value).tz_convert("UTC")
+            value = value.tz_localize(None).to_numpy("datetime64[ns]")
+        else:
+            value = value.to_numpy()
+    if isinstance(value, np.ndarray):
+        if value.ndim != 1:
+            raise ProgrammingError(
+                "Only one-dimensional arrays can be used as parameters, "
+                f"got an array with {value.ndim} dimensions."
+            )
+        return pykx.toq(np.ascontiguousarray(value))
+    return value
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import collections
+import itertools
+import queue
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import Generator
+from typing import Sequence
+from typing import TYPE_CHECKING
+
+import pykx
+
+from huunq.parameters import to_q_parameter
+
+if TYPE_CHECKING:
+    from huunq.connection import Connection
+
+
+def iter_partitions(
+    connection: Connection,
+    operation: str,
+    parameters: Sequence[Any],
+    ranges: Sequence[tuple[Any, Any]],
+    connections: int,
+) -> Generator[pykx.Table, None, None]:
+    """Runs a statement once per range, concurrently, and yields the
+    results in the order of the ranges.
+
+    The statement is run over up to `connections` new connections to the
+    same server as `connection`, which are opened as needed and closed
+    once the generator is exhausted or closed. At most `connections` ranges
+    are run ahead of the one being read, and results are released once
+    yielded, so memory use follows the pace of the reader. The bounds of
+    each range are appended to `parameters`.
+
+    Args:
+        connection (Connection): The connection whose server and options
+            are used to open the worker connections.
+        operation (str): The SQL operation to run, in the `numeric_dollar`
+            parameter style.
+        parameters (Sequence[Any]): The parameters of the operation,
+            excluding the bounds of the range.
+        ranges (Sequence[tuple[Any, Any]]): The bounds of each range.
+        connections (int): The maximum number of concurrent connections.
+
+    Yields:
+        pykx.Table: The result of the operation for each range.
+    """
+    workers = max(1, min(connections, len(ranges)))
+    idle: queue.SimpleQueue[Connection | None] = queue.SimpleQueue()
+    for _ in range(workers):
+        idle.put(None)
+    opened: list[Connection] = []
+
+    def run(bounds: tuple[Any, Any]) -> pykx.Table:
+        worker = idle.get()
+        if worker is None:
+            worker = connection.clone()
+            opened.append(worker)
+        try:
+            return worker.q_connection.sql(
+                operation, *parameters, *map(to_q_parameter, bounds)
+            )
+        finally:
+            idle.put(worker)
+
+    pending = iter(ranges)
+    futures: collections.deque[Future[pykx.Table]] = collections.deque()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            try:
+                for bounds in itertools.islice(pending, workers):
+                    futures.append(executor.submit(run, bounds))
+                while futures:
+                    table = futures.popleft().result()
+                    next_bounds = next(pending, None)
+                    if next_bounds is not None:
+                        futures.append(executor.submit(run, next_bounds))
+                    yield table
+            finally:
+                for future in futures:
+                    future.cancel()
+    finally:
+        for worker in opened:
+            worker.close()
@@ -0,0 +1,412 @@
+"""Profiles a SQL statement against a kdb+ server.
+
+The statement is run several times with `Cursor.execute` and
+`Cursor.fetchall`, and the time spent in each stage is reported:
+
+* translate: the rest of `Cursor.execute`, i.e. parameter style translation,
+  conversion to kdb+ objects and result cache lookups.
+* network: round trip time minus server execution, which covers the
+  transfer of the request and of the result, and its decoding into pykx
+  objects by pykx, which cannot be timed apart.
+* server: execution time of the requests, measured on the q side.
+* deserialize: conversion of the pykx tables to pandas.
+* rows: conversion of the pandas frames to sequences of tuples.
+
+Requests made while fetching, such as the batches of a streamed result,
+count towards network and server as well.
+
+Usage:
+    python -m huunq.profile --port 5000 -n 20 \\
+        "SELECT * FROM trades WHERE price > :1" 0.5
+"""
+from __future__ import annotations
+
+import argparse
+import ast
+import collections
+import cProfile
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from types import FrameType
+from typing import Any
+from typing import Callable
+from typing import Sequence
+from typing import TypeVar
+
+import pandas as pd
+import pykx
+
+from huunq.cache import ResultCache
+from huunq.connection import connect
+from huunq.connection import Connection
+from huunq.cursor import Cursor
+from huunq.typing import LimitAction
+from huunq.typing import QConnection
+
+R = TypeVar("R")
+
+STAGES = ("translate", "network", "server", "deserialize", "rows")
+
+_TIMED_SQL = "{[q;a] t:.z.p; r:.s.sp[q;a]; (.z.p-t; r)}"
+_TIMED_EVAL = "{[f] t:.z.p; r:value f; (.z.p-t; r)}"
+_TIMED_APPLY = "{[f;a] t:.z.p; r:(value f) . a; (.z.p-t; r)}"
+
+Recorder = Callable[[str, float], None]
+
+
+class StackSampler:
+    def __init__(self, interval: float = 0.001) -> None:
+        """Samples the call stack of the current thread in the background.
+
+        Samples are only taken while `enabled` is set, and are aggregated
+        in the folded format understood by flamegraph.pl and speedscope.
+
+        Args:
+            interval (float, optional): The time between two samples,
+            in seconds. Defaults to 0.001.
+        """
+        self.interval = interval
+        self.enabled = False
+        self.stacks: collections.Counter[str] = collections.Counter()
+        self.__thread_id = threading.get_ident()
+        self.__stopped = threading.Event()
+        self.__thread = threading.Thread(target=self.__run, daemon=True)
+
+    def start(self) -> None:
+        self.__thread.start()
+
+    def stop(self) -> None:
+        self.__stopped.set()
+        self.__thread.join()
+
+    def __run(self) -> None:
+        while not self.__stopped.wait(self.interval):
+            if not self.enabled:
+                continue
+            frame = sys._current_frames().get(self.__thread_id)
+            if frame is not None:
+                self.stacks[self.__fold(frame)] += 1
+
+    @staticmethod
+    def __fold(frame: FrameType | None) -> str:
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f"{code.co_filename}:{code.co_name}")
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+    def write(self, path: str) -> None:
+        """Writes the collected samples as folded stacks.
+
+        Args:
+            path (str): The path of the file to write.
+        """
+        with open(path, "w") as file:
+            for stack, count in self.stacks.items():
+                file.write(f"{stack} {count}\n")
+
+
+class _TimedQConnection:
+    def __init__(self, q_connection: QConnection, record: Recorder) -> None:
+        """Forwards requests to a q connection, recording their round trip
+        and server execution times.
+
+        Args:
+            q_connection (QConnection): The q connection to forward to.
+            record (Recorder): Called with each stage and its duration.
+        """
+        self.__q_connection = q_connection
+        self.__record = record
+
+    @property
+    def closed(self) -> bool:
+        return self.__q_connection.closed
+
+    def __timed(self, query: str, *args: Any) -> Any:
+        start = time.perf_counter()
+        server_time, result = self.__q_connection(query, *args)
+        round_trip = time.perf_counter() - start
+        server = server_time.py().total_seconds()
+        self.__record("server", server)
+        self.__record("network", max(round_trip - server, 0.0))
+        return result
+
+    def __call__(self, query: str | bytes, *args: Any) -> Any:
+        if not args:
+            return self.__timed(_TIMED_EVAL, pykx.CharVector(query))
+        return self.__timed(_TIMED_APPLY, pykx.CharVector(query), [*args])
+
+    def sql(self, query: str, *args: Any) -> Any:
+        return self.__timed(_TIMED_SQL, pykx.CharVector(query), args)
+
+    def close(self) -> None:
+        self.__q_connection.close()
+
+
+def _timed_cursor(record: Recorder) -> type[Cursor]:
+    """Creates a cursor class recording the time spent converting results,
+    see `Cursor.table_to_rows`."""
+
+    class TimedCursor(Cursor):
+        @staticmethod
+        def table_to_frame(table: pykx.Table) -> pd.DataFrame:
+            start = time.perf_counter()
+            frame = Cursor.table_to_frame(table)
+            record("deserialize", time.perf_counter() - start)
+            return frame
+
+        @staticmethod
+        def frame_to_rows(
+            frame: pd.DataFrame,
+        ) -> Sequence[tuple[object, ...]]:
+            start = time.perf_counter()
+            rows = Cursor.frame_to_rows(frame)
+            record("rows", time.perf_counter() - start)
+            return rows
+
+    return TimedCursor
+
+
+class Profiler:
+    def __init__(
+        self,
+        connection: Connection,
+        operation: str,
+        parameters: Sequence[Any] | None = None,
+        *,
+        max_rows: int | None = None,
+        max_result_bytes: int | None = None,
+        on_limit: LimitAction = "raise",
+    ) -> None:
+        """Profiles the stages of executing a statement and fetching
+        its results with a cursor.
+
+        Args:
+            connection (Connection): The connection to run the statement on.
+            operation (str): The SQL operation to profile.
+            parameters (Sequence[Any] | None, optional): The parameters to be
+            used in the SQL operation. Defaults to None.
+            max_rows (int | None, optional): The `max_rows` of the cursor.
+                Defaults to None.
+            max_result_bytes (int | None, optional): The `max_result_bytes`
+                of the cursor. Defaults to None.
+            on_limit (LimitAction, optional): The `on_limit` of the cursor.
+                Defaults to "raise".
+        """
+        self.connection = connection
+        self.operation = operation
+        self.parameters = parameters
+        self.max_rows = max_rows
+        self.max_result_bytes = max_result_bytes
+        self.on_limit: LimitAction = on_limit
+        self.timings: dict[str, list[float]] = {stage: [] for stage in STAGES}
+        self.peak_memory = 0
+        self.rows = 0
+        self.profile: cProfile.Profile | None = None
+        self.sampler: StackSampler | None = None
+        self.__run_timings = dict.fromkeys(STAGES, 0.0)
+        self.__cursor_class = _timed_cursor(self.__record)
+
+    def __record(self, stage: str, elapsed: float) -> None:
+        self.__run_timings[stage] += elapsed
+
+    def __client(self, func: Callable[[], R]) -> R:
+        """Runs client-side code under the optional profilers."""
+        if self.profile is not None:
+            self.profile.enable()
+        if self.sampler is not None:
+            self.sampler.enabled = True
+        try:
+            return func()
+        finally:
+            if self.sampler is not None:
+                self.sampler.enabled = False
+            if self.profile is not None:
+                self.profile.disable()
+
+    def run_once(self) -> dict[str, float]:
+        """Runs the statement once and measures each stage.
+
+        Returns:
+            dict[str, float]: The time spent in each stage, in seconds.
+        """
+        timings = self.__run_timings = dict.fromkeys(STAGES, 0.0)
+        q_connection = self.connection.q_connection
+        self.connection.q_connection = _TimedQConnection(
+            q_connection, self.__record
+        )
+        cursor = self.__cursor_class(self.connection)
+        cursor.max_rows = self.max_rows
+        cursor.max_result_bytes = self.max_result_bytes
+        cursor.on_limit = self.on_limit
+        try:
+            start = time.perf_counter()
+            self.__client(
+                lambda: cursor.execute(self.operation, self.parameters)
+            )
+            elapsed = time.perf_counter() - start
+            remote = timings["network"] + timings["server"]
+            timings["translate"] = max(elapsed - remote, 0.0)
+            rows = self.__client(cursor.fetchall)
+        finally:
+            cursor.close()
+            self.connection.q_connection = q_connection
+
+        self.rows = len(rows)
+        return timings
+
+    def run(self, repeat: int) -> None:
+        """Runs the statement `repeat` times, then once more with memory
+        tracing enabled to measure the peak client-side memory usage.
+
+        Args:
+            repeat (int): The number of timed runs.
+        """
+        for _ in range(repeat):
+            for stage, elapsed in self.run_once().items():
+                self.timings[stage].append(elapsed)
+
+        profile, self.profile = self.profile, None
+        sampler, self.sampler = self.sampler, None
+        tracemalloc.start()
+        try:
+            self.run_once()
+            _, self.peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+            self.profile, self.sampler = profile, sampler
+
+    def report(self) -> str:
+        """Formats the collected timings as a table.
+
+        Returns:
+            str: The report.
+        """
+        lines = [
+            f"{'stage':<12}{'min':>12}{'median':>12}{'mean':>12}{'max':>12}"
+        ]
+        totals = [sum(run) for run in zip(*self.timings.values())]
+        for stage, timings in (*self.timings.items(), ("total", totals)):
+            if not timings:
+                continue
+            summary = (
+                min(timings),
+                statistics.median(timings),
+                statistics.mean(timings),
+                max(timings),
+            )
+            values = "".join(f"{value * 1e3:>9.3f} ms" for value in summary)
+            lines.append(f"{stage:<12}{values}")
+        lines.append(f"rows: {self.rows}")
+        lines.append(f"peak memory: {self.peak_memory / 2**20:.3f} MiB")
+        return "\n".join(lines)
+
+
+def _parse_parameter(value: str) -> Any:
+    try:
+        return ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return value
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m huunq.profile",
+        description="Profiles a SQL statement against a kdb+ server.",
+        epilog=(
+            "The connection options are those of huunq.connect, except "
+            "wait: the profiler always waits for the results it measures."
+        ),
+    )
+    parser.add_argument("operation", help="The SQL operation to profile.")
+    parser.add_argument(
+        "parameters",
+        nargs="*",
+        type=_parse_parameter,
+        help="The parameters of the operation, parsed as Python literals.",
+    )
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument("--username", default="")
+    parser.add_argument("--password", default="")
+    parser.add_argument("--timeout", type=float, default=0.0)
+    parser.add_argument("--no-large-messages", action="store_true")
+    parser.add_argument("--tls", action="store_true")
+    parser.add_argument("--unix", action="store_true")
+    parser.add_argument("--no-ctx", action="store_true")
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Execute the statement with a result cache.",
+    )
+    parser.add_argument("--max-rows", type=int, default=None)
+    parser.add_argument("--max-result-bytes", type=int, default=None)
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream results over the limits instead of failing.",
+    )
+    parser.add_argument(
+        "-n",
+        "--repeat",
+        type=int,
+        default=10,
+        help="The number of timed runs. Defaults to 10.",
+    )
+    parser.add_argument(
+        "--cprofile",
+        metavar="PATH",
+        help="Write cProfile statistics of the client to PATH.",
+    )
+    parser.add_argument(
+        "--flamegraph",
+        metavar="PATH",
+        help="Write folded stacks of the client to PATH.",
+    )
+    args = parser.parse_args(argv)
+
+    with connect(
+        host=args.host,
+        port=args.port,
+        username=args.username,
+        password=args.password,
+        timeout=args.timeout,
+        large_messages=not args.no_large_messages,
+        tls=args.tls,
+        unix=args.unix,
+        no_ctx=args.no_ctx,
+        cache=ResultCache() if args.cache else None,
+    ) as connection:
+        profiler = Profiler(
+            connection,
+            args.operation,
+            args.parameters or None,
+            max_rows=args.max_rows,
+            max_result_bytes=args.max_result_bytes,
+            on_limit="stream" if args.stream else "raise",
+        )
+        if args.cprofile:
+            profiler.profile = cProfile.Profile()
+        if args.flamegraph:
+            profiler.sampler = StackSampler()
+            profiler.sampler.start()
+        try:
+            profiler.run(args.repeat)
+        finally:
+            if profiler.sampler is not None:
+                profiler.sampler.stop()
+
+    print(profiler.report())
+    if profiler.profile is not None:
+        profiler.profile.dump_stats(args.cprofile)
+    if profiler.sampler is not None:
+        profiler.sampler.write(args.flamegraph)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,413 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from multiprocessing.synchronize import Lock as ProcessLock
+from threading import Lock as ThreadLock
+from typing import Any
+from typing import Callable
+from typing import NamedTuple
+from typing import Sequence
+from typing import Tuple
+
+from pykx.exceptions import PyKXException
+from pykx.exceptions import QError
+
+from huunq.cache import ResultCache
+from huunq.connection import Connection
+from huunq.exceptions import InterfaceError
+from huunq.exceptions import OperationalError
+from huunq.typing import QConnection
+from huunq.typing import RoutingStrategy
+
+Endpoint = Tuple[str, int]
+
+
+def _is_transport_error(error: Exception, connection: Connection) -> bool:
+    """Whether a request failed because its replica could not be reached.
+
+    pykx reports socket failures as `OSError` or `PyKXException` and closes
+    the connection, while errors raised by q leave it open.
+    """
+    if connection.is_closed or isinstance(error, OSError):
+        return True
+    return isinstance(error, PyKXException) and not isinstance(error, QError)
+
+
+class ReplicaStats(NamedTuple):
+    host: str
+    port: int
+    available: bool
+    outstanding: int
+    requests: int
+    failures: int
+    latency: float | None
+
+
+class Replica:
+    def __init__(self, host: str, port: int) -> None:
+        """The state of one replica, as seen by a `ReplicaRouter`.
+
+        Args:
+            host (str): The host name of the replica.
+            port (int): The port of the replica.
+        """
+        self.host = host
+        self.port = port
+        self.connection: Connection | None = None
+        self.draining: list[Connection] = []
+        self.outstanding = 0
+        self.requests = 0
+        self.failures = 0
+        self.latency: float | None = None
+        self.ejected_until = 0.0
+        self.open_lock = threading.Lock()
+
+    def is_available(self, now: float) -> bool:
+        return self.ejected_until <= now
+
+    @property
+    def stats(self) -> ReplicaStats:
+        return ReplicaStats(
+            host=self.host,
+            port=self.port,
+            available=self.is_available(time.monotonic()),
+            outstanding=self.outstanding,
+            requests=self.requests,
+            failures=self.failures,
+            latency=self.latency,
+        )
+
+
+class ReplicaRouter:
+    def __init__(
+        self,
+        endpoints: Sequence[Endpoint],
+        options: dict[str, Any],
+        *,
+        strategy: RoutingStrategy = "least_outstanding",
+        eject_for: float = 30.0,
+        slow_after: float | None = None,
+        smoothing: float = 0.2,
+    ) -> None:
+        """Routes each request to one of several identical replicas.
+
+        Replicas that cannot be reached, or whose smoothed latency exceeds
+        `slow_after`, are ejected for `eject_for` seconds and then probed
+        again by the next requests. The connection to an ejected replica is
+        closed once its requests in flight are answered. A request is only
+        retried on another replica if its replica could not be connected
+        to: once sent, it may have run on the server, so a failure raises
+        an OperationalError instead.
+
+        Args:
+            endpoints (Sequence[Endpoint]): The `(host, port)` of each replica.
+            options (dict[str, Any]): The keyword arguments used to open the
+                connection to each replica, see `Connection`.
+            strategy (RoutingStrategy, optional): How a replica is chosen for
+                each request: "least_outstanding" picks the replica with the
+                fewest requests in flight, "latency" picks replicas at random
+                with a probability inversely proportional to their latency
+                and requests in flight. Defaults to "least_outstanding".
+            eject_for (float, optional): How long a replica stays ejected,
+                in seconds. Defaults to 30.0.
+            slow_after (float | None, optional): The smoothed latency, in
+                seconds, above which a replica is ejected. Replicas are never
+                ejected for being slow if None. Defaults to None.
+            smoothing (float, optional): The weight of the latest request in
+                the exponentially weighted latency of a replica.
+                Defaults to 0.2.
+
+        Raises:
+            OperationalError: If none of the replicas can be reached.
+        """
+        self.strategy = strategy
+        self.eject_for = eject_for
+        self.slow_after = slow_after
+        self.smoothing = smoothing
+        self.__options = options
+        self.__replicas = [Replica(host, port) for host, port in endpoints]
+        self.__lock = threading.Lock()
+        self.__closed = False
+        for replica in self.__replicas:
+            self.__open(replica)
+        if all(replica.connection is None for replica in self.__replicas):
+            raise OperationalError("None of the replicas can be reached.")
+
+    @property
+    def stats(self) -> list[ReplicaStats]:
+        """The request counts and latency of each replica."""
+        with self.__lock:
+            return [replica.stats for replica in self.__replicas]
+
+    @property
+    def closed(self) -> bool:
+        """Whether the router is closed."""
+        return self.__closed
+
+    def __open(self, replica: Replica) -> bool:
+        """Connects to a replica, or ejects it if it cannot be reached."""
+        try:
+            replica.connection = Connection(
+                replica.host, replica.port, **self.__options
+            )
+        except (OSError, PyKXException):
+            with self.__lock:
+                self.__eject(replica)
+            return False
+        return True
+
+    def __eject(self, replica: Replica) -> None:
+        replica.failures += 1
+        replica.latency = None
+        replica.ejected_until = time.monotonic() + self.eject_for
+        if replica.connection is not None:
+            replica.draining.append(replica.connection)
+            replica.connection = None
+        self.__drain(replica)
+
+    @staticmethod
+    def __drain(replica: Replica) -> None:
+        """Closes the connections of an ejected replica once no request
+        is in flight on them anymore."""
+        if replica.outstanding == 0:
+            for connection in replica.draining:
+                connection.close()
+            replica.draining.clear()
+
+    def __is_slow(self, replica: Replica) -> bool:
+        """Whether a replica is too slow and can be left out."""
+        if self.slow_after is None or replica.latency is None:
+            return False
+        now = time.monotonic()
+        return replica.latency > self.slow_after and any(
+            other.is_available(now)
+            for other in self.__replicas
+            if other is not replica
+        )
+
+    def __choose(self, excluded: list[Replica]) -> Replica:
+        """Picks a replica for a request and counts the request in flight."""
+        with self.__lock:
+            now = time.monotonic()
+            candidates = [
+                replica
+                for replica in self.__replicas
+                if replica.is_available(now) and replica not in excluded
+            ]
+            if not candidates:
+                raise OperationalError("None of the replicas is available.")
+            unprobed = [r for r in candidates if r.latency is None]
+            if unprobed:
+                replica = min(unprobed, key=lambda r: r.outstanding)
+            elif self.strategy == "latency":
+                weights = [
+                    1.0 / (max(r.latency or 0.0, 1e-6) * (r.outstanding + 1))
+                    for r in candidates
+                ]
+                replica = random.choices(candidates, weights)[0]
+            else:
+                replica = min(
+                    candidates, key=lambda r: (r.outstanding, r.latency)
+                )
+            replica.outstanding += 1
+            replica.requests += 1
+            return replica
+
+    def __route(self, request: Callable[[QConnection], Any]) -> Any:
+        if self.__closed:
+            raise InterfaceError("Cannot operate on a closed connection.")
+        tried: list[Replica] = []
+        while True:
+            replica = self.__choose(tried)
+            tried.append(replica)
+            start = time.perf_counter()
+            connection = None
+            try:
+                with replica.open_lock:
+                    if replica.connection is None and not self.__open(replica):
+                        continue
+                connection = replica.connection
+                assert connection is not None
+                result = request(connection.q_connection)
+            except Exception as e:
+                if connection is None or not _is_transport_error(
+                    e, connection
+                ):
+                    raise
+                with self.__lock:
+                    if replica.connection is connection:
+                        self.__eject(replica)
+                raise OperationalError(
+                    f"The request to {replica.host}:{replica.port} failed "
+                    "and may have been executed."
+                ) from e
+            finally:
+                with self.__lock:
+                    replica.outstanding -= 1
+                    self.__drain(replica)
+            elapsed = time.perf_counter() - start
+            with self.__lock:
+                if replica.latency is not None:
+                    elapsed *= self.smoothing
+                    elapsed += (1 - self.smoothing) * replica.latency
+                replica.latency = elapsed
+                if replica.connection is connection and self.__is_slow(
+                    replica
+                ):
+                    self.__eject(replica)
+            return result
+
+    def __call__(self, query: str | bytes, *args: Any) -> Any:
+        """Evaluates a q expression on one of the replicas."""
+        return self.__route(lambda q_connection: q_connection(query, *args))
+
+    def sql(self, query: str, *args: Any) -> Any:
+        """Executes a SQL statement on one of the replicas."""
+        return self.__route(
+            lambda q_connection: q_connection.sql(query, *args)
+        )
+
+    def close(self) -> None:
+        """Closes the connections to all the replicas."""
+        self.__closed = True
+        with self.__lock:
+            for replica in self.__replicas:
+                if replica.connection is not None:
+                    replica.connection.close()
+                    replica.connection = None
+                for connection in replica.draining:
+                    connection.close()
+                replica.draining.clear()
+
+
+class ReplicatedConnection(Connection):
+    def __init__(
+        self,
+        endpoints: Sequence[Endpoint],
+        *,
+        strategy: RoutingStrategy = "least_outstanding",
+        eject_for: float = 30.0,
+        slow_after: float | None = None,
+        cache: ResultCache | None = None,
+        **options: Any,
+    ) -> None:
+        """A connection that spreads its queries across replicas,
+        see `ReplicaRouter`.
+
+        Args:
+            endpoints (Sequence[Endpoint]): The `(host, port)` of each replica.
+            strategy (RoutingStrategy, optional): How a replica is chosen for
+                each request. Defaults to "least_outstanding".
+            eject_for (float, optional): How long an unreachable or slow
+                replica stays ejected, in seconds. Defaults to 30.0.
+            slow_after (float | None, optional): The smoothed latency, in
+                seconds, above which a replica is ejected. Defaults to None.
+            cache (ResultCache | None, optional): The cache in which the
+                results of SELECT statements are kept. Defaults to None.
+            **options (Any): The keyword arguments used to open the connection
+                to each replica, see `Connection`.
+
+        Raises:
+            InterfaceError: If no endpoint is specified.
+            OperationalError: If none of the replicas can be reached.
+        """
+        if not endpoints:
+            raise InterfaceError("At least one endpoint must be specified.")
+        self.endpoints = list(endpoints)
+        self.__routing: dict[str, Any] = {
+            "strategy": strategy,
+            "eject_for": eject_for,
+            "slow_after": slow_after,
+        }
+        self.__options = options
+        host, port = self.endpoints[0]
+        super().__init__(host, port, cache=cache, **options)
+
+    def _connect(self, lock: ThreadLock | ProcessLock | None) -> QConnection:
+        self.router = ReplicaRouter(
+            self.endpoints, self.__options, **self.__routing
+        )
+        return self.router
+
+    @property
+    def replica_stats(self) -> list[ReplicaStats]:
+        """The request counts and latency of each replica."""
+        return self.router.stats
+
+    def clone(self) -> ReplicatedConnection:
+        """
+        Opens a new connection to the same replicas, with the same options.
+
+        Returns:
+            ReplicatedConnection: The new connection object.
+        """
+        return ReplicatedConnection(
+            self.endpoints, **self.__routing, **self.__options
+        )
+
+
+def connect_replicas(
+    endpoints: Sequence[Endpoint],
+    *,
+    strategy: RoutingStrategy = "least_outstanding",
+    eject_for: float = 30.0,
+    slow_after: float | None = None,
+    username: str | bytes = "",
+    password: str | bytes = "",
+    timeout: float = 0.0,
+    large_messages: bool = True,
+    tls: bool = False,
+    wait: bool = True,
+    no_ctx: bool = False,
+    cache: ResultCache | None = None,
+) -> ReplicatedConnection:
+    """
+    Connects to several identical replicas and spreads queries across them.
+
+    Args:
+        endpoints (Sequence[Endpoint]): The `(host, port)` of each replica.
+        strategy (RoutingStrategy, optional): How a replica is chosen for
+            each query. "least_outstanding" picks the replica with the fewest
+            queries in flight, "latency" favors the replicas with the lowest
+            latency. Defaults to "least_outstanding".
+        eject_for (float, optional): How long an unreachable or slow replica
+            is left out before being probed again, in seconds.
+            Defaults to 30.0.
+        slow_after (float | None, optional): The smoothed latency, in
+            seconds, above which a replica is ejected. Replicas are never
+            ejected for being slow if None. Defaults to None.
+        username (str | bytes, optional): Username for
+            q connection authorization. Defaults to "".
+        password (str | bytes, optional): Password for
+            q connection authorization. Defaults to "".
+        timeout (float, optional): Timeout for blocking socket operations
+            in seconds. Defaults to 0.0.
+        large_messages (bool, optional): Whether support for messages >2GB
+            should be enabled. Defaults to True.
+        tls (bool, optional): Whether TLS should be used. Defaults to False.
+        wait (bool, optional): Whether the q servers should send a response
+            to the queries. Defaults to True.
+        no_ctx (bool, optional): Whether the context interface should be
+            disabled. Defaults to False.
+        cache (ResultCache | None, optional): The cache in which the results
+            of SELECT statements are kept. Defaults to None.
+
+    Returns:
+        ReplicatedConnection: The connection object.
+    """
+    return ReplicatedConnection(
+        endpoints,
+        strategy=strategy,
+        eject_for=eject_for,
+        slow_after=slow_after,
+        username=username,
+        password=password,
+        timeout=timeout,
+        large_messages=large_messages,
+        tls=tls,
+        wait=wait,
+        no_ctx=no_ctx,
+        cache=cache,
+    )
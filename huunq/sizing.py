@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from typing import Final
+from typing import Iterable
+
+import pykx
+
+# Size in bytes of a single item of each kdb+ vector type, by type number.
+# Symbols are counted as a pointer to their interned string.
+KDB_TYPE_SIZES: Final[dict[int, int]] = {
+    1: 1,  # boolean
+    2: 16,  # guid
+    4: 1,  # byte
+    5: 2,  # short
+    6: 4,  # int
+    7: 8,  # long
+    8: 4,  # real
+    9: 8,  # float
+    10: 1,  # char
+    11: 8,  # symbol
+    12: 8,  # timestamp
+    13: 4,  # month
+    14: 4,  # date
+    15: 8,  # datetime
+    16: 8,  # timespan
+    17: 4,  # minute
+    18: 4,  # second
+    19: 4,  # time
+}
+# Size assumed for an item of any other column, such as a string column.
+DEFAULT_TYPE_SIZE: Final = 32
+
+# Approximate size of a row tuple and of each of its Python values.
+_TUPLE_SIZE: Final = 40
+_VALUE_SIZE: Final = 40
+
+
+def estimate_row_bytes(types: Iterable[int]) -> int:
+    """Estimates the size of one row of a kdb+ table.
+
+    Args:
+        types (Iterable[int]): The kdb+ type number of each column.
+
+    Returns:
+        int: The estimated size of a row, in bytes.
+    """
+    return sum(KDB_TYPE_SIZES.get(abs(t), DEFAULT_TYPE_SIZE) for t in types)
+
+
+def estimate_table_bytes(table: pykx.Table) -> int:
+    """Estimates the size of a kdb+ table from the types of its columns.
+
+    Args:
+        table (pykx.Table): The table to estimate the size of.
+
+    Returns:
+        int: The estimated size of the table, in bytes.
+    """
+    types = (getattr(type(column), "t", 0) for column in table.flip.values())
+    return len(table) * estimate_row_bytes(types)
+
+
+def estimate_rows_bytes(table: pykx.Table) -> int:
+    """Estimates the size of a kdb+ table once converted to Python tuples,
+    without converting it.
+
+    Args:
+        table (pykx.Table): The table to estimate the size of.
+
+    Returns:
+        int: The estimated size of the rows, in bytes.
+    """
+    return len(table) * (_TUPLE_SIZE + _VALUE_SIZE * len(table.flip))
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import re
+from typing import Iterator
+
+from huunq.exceptions import ProgrammingError
+
+
+def _scan(script: str, quoted: bool = False) -> Iterator[tuple[int, str]]:
+    """Yields the position and character of every character of the script
+    that is outside of string literals, quoted identifiers and comments,
+    or only outside of comments if `quoted` is set."""
+    position = 0
+    length = len(script)
+    while position < length:
+        char = script[position]
+        if char in "'\"":
+            end = position + 1
+            while end < length:
+                if script[end] == char:
+                    if end + 1 < length and script[end + 1] == char:
+                        end += 2
+                        continue
+                    break
+                end += 1
+            if quoted:
+                yield from enumerate(script[position : end + 1], position)
+            position = end + 1
+        elif script.startswith("--", position):
+            end = script.find("\n", position)
+            position = length if end == -1 else end + 1
+        elif script.startswith("/*", position):
+            end = script.find("*/", position + 2)
+            position = length if end == -1 else end + 2
+        else:
+            yield position, char
+            position += 1
+
+
+def _code_end(text: str) -> int:
+    """Returns the position after the last character of the text that is
+    neither whitespace nor part of a comment, or 0 if there is none."""
+    end = 0
+    for position, char in _scan(text, quoted=True):
+        if not char.isspace():
+            end = position + 1
+    return end
+
+
+def split_statements(script: str) -> list[str]:
+    """Splits a SQL script into its individual statements.
+
+    Statements are separated by semicolons. Semicolons within string
+    literals, quoted identifiers and comments are ignored, and statements
+    that are empty or only hold comments are dropped.
+
+    Args:
+        script (str): The SQL script to split.
+
+    Returns:
+        list[str]: The statements of the script, stripped of surrounding
+        whitespace.
+    """
+    statements = []
+    start = 0
+    for position, char in _scan(script):
+        if char == ";":
+            statements.append(script[start:position].strip())
+            start = position + 1
+    statements.append(script[start:].strip())
+    return [statement for statement in statements if _code_end(statement)]
+
+
+_CLAUSE_PATTERN = re.compile(
+    r"\b(?:WHERE|GROUP\s+BY|HAVING|ORDER\s+BY|LIMIT)\b", re.IGNORECASE
+)
+
+
+def _top_level(operation: str) -> str:
+    """Blanks out everything in the operation that is not at the top level,
+    i.e. string literals, quoted identifiers, comments and parentheses."""
+    masked = [" "] * len(operation)
+    depth = 0
+    for position, char in _scan(operation):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif depth == 0:
+            masked[position] = char
+    return "".join(masked)
+
+
+def _rest(trailing: str, clauses: str) -> str:
+    """Joins the whitespace and comments following an edited clause to the
+    clauses after it, keeping comments out of the edited clause."""
+    if trailing.strip():
+        return f"{trailing}{clauses}"
+    return f" {clauses}" if clauses else ""
+
+
+def add_predicate(operation: str, predicate: str) -> str:
+    """Restricts a SELECT statement with an additional predicate.
+
+    The predicate is prepended to the top-level WHERE clause of the
+    statement, so that q can use it to select partitions before evaluating
+    the other constraints. A WHERE clause is added if there is none.
+
+    Args:
+        operation (str): The SELECT statement to restrict.
+        predicate (str): The SQL predicate to add.
+
+    Raises:
+        ProgrammingError: If the operation is not a single SELECT statement.
+
+    Returns:
+        str: The restricted statement.
+    """
+    operation = operation.strip().rstrip(";")
+    masked = _top_level(operation)
+    if not masked.lstrip().upper().startswith("SELECT") or ";" in masked:
+        raise ProgrammingError(
+            "Only a single SELECT statement can be restricted."
+        )
+    clauses = list(_CLAUSE_PATTERN.finditer(masked))
+    if clauses and clauses[0].group().upper() == "WHERE":
+        start = clauses[0].end()
+        end = clauses[1].start() if len(clauses) > 1 else len(operation)
+        condition = operation[start:end]
+        code_end = _code_end(condition)
+        return (
+            f"{operation[:start]} {predicate} AND "
+            f"({condition[:code_end].strip()})"
+            f"{_rest(condition[code_end:], operation[end:])}"
+        )
+    end = clauses[0].start() if clauses else len(operation)
+    code_end = _code_end(operation[:end])
+    return (
+        f"{operation[:code_end]} WHERE {predicate}"
+        f"{_rest(operation[code_end:end], operation[end:])}"
+    )
+
+
+_TABLE_PATTERN = re.compile(r"\b(?:FROM|JOIN)\b", re.IGNORECASE)
+_IDENTIFIER_PATTERN = re.compile(r'\s*(?:"([^"]+)"|([A-Za-z_.][\w.]*))')
+_ALIAS_PATTERN = re.compile(
+    r'\s+(?:AS\s+)?(?:"[^"]+"|(?!(?:WHERE|JOIN|INNER|LEFT|RIGHT|FULL|CROSS'
+    r"|OUTER|NATURAL|ON|USING|GROUP|ORDER|HAVING|LIMIT|OFFSET|UNION"
+    r"|EXCEPT|INTERSECT)\b)[A-Za-z_]\w*)",
+    re.IGNORECASE,
+)
+_LIST_PATTERN = re.compile(r"\s*,")
+_SUBQUERY_PATTERN = re.compile(r"\s*\(")
+
+
+def _closing(masked: str, position: int) -> int:
+    """Returns the position after the parenthesis closing the one
+    at `position`."""
+    depth = 0
+    for end in range(position, len(masked)):
+        if masked[end] == "(":
+            depth += 1
+        elif masked[end] == ")":
+            depth -= 1
+            if depth == 0:
+                return end + 1
+    return len(masked)
+
+
+def referenced_tables(operation: str) -> frozenset[str]:
+    """Finds the names of the tables a statement reads from.
+
+    Tables are the identifiers following a FROM or JOIN keyword, or
+    separated by commas in a FROM clause, including in subqueries.
+
+    Args:
+        operation (str): The SQL statement to inspect.
+
+    Returns:
+        frozenset[str]: The names of the referenced tables.
+    """
+    masked = [" "] * len(operation)
+    for position, char in _scan(operation):
+        masked[position] = char
+    text = "".join(masked)
+    tables = set()
+    for keyword in _TABLE_PATTERN.finditer(text):
+        position = keyword.end()
+        while True:
+            subquery = _SUBQUERY_PATTERN.match(text, position)
+            identifier = _IDENTIFIER_PATTERN.match(operation, position)
+            if subquery is not None:
+                position = _closing(text, subquery.end() - 1)
+            elif identifier is not None:
+                tables.add(identifier.group(1) or identifier.group(2))
+                position = identifier.end()
+            else:
+                break
+            alias = _ALIAS_PATTERN.match(operation, position)
+            if alias is not None:
+                position = alias.end()
+            separator = _LIST_PATTERN.match(text, position)
+            if separator is None:
+                break
+            position = separator.end()
+    return frozenset(tables)
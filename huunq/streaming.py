@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import time
+import uuid
+from typing import Any
+from typing import Generator
+from typing import NamedTuple
+from typing import Sequence
+
+import numpy as np
+import pykx
+
+from huunq.sizing import DEFAULT_TYPE_SIZE
+from huunq.sizing import KDB_TYPE_SIZES
+from huunq.typing import QConnection
+
+# Size of an item of each kdb+ type number up to 20, the last one standing
+# for any other type.
+_WIDTHS = np.array(
+    [KDB_TYPE_SIZES.get(t, DEFAULT_TYPE_SIZE) for t in range(21)]
+)
+_UNLIMITED = 2**63 - 1  # 0W
+
+# Runs a statement and estimates the size of its result. Results that are
+# not tables, such as those of DML statements, are returned as they are with
+# a row count of -1. A table is returned if it is within the limits,
+# otherwise only its schema is returned and the table is kept in .huunq.r if
+# it is to be streamed. Kept tables are owned by the handle of the client in
+# .huunq.w, and are dropped by a .z.pc handler, chained to any existing one,
+# if the client disconnects without dropping them.
+_EXECUTE = """{[k;q;a;mr;mb;s;w]
+    r:.s.sp[q;a];
+    if[not 98h=type r; :(-1;0;r)];
+    n:count r;
+    b:n*sum w 20&abs value type each flip r;
+    if[(n<=mr) and b<=mb; :(n;b;r)];
+    if[s;
+        if[0b~@[get;`.huunq.pc;0b];
+            .huunq.r:(`$())!();
+            .huunq.w:(`$())!`int$();
+            .huunq.drop:{[k] .huunq.r:k _ .huunq.r; .huunq.w:k _ .huunq.w;};
+            .huunq.pc:@[get;`.z.pc;{{[h]}}];
+            .z.pc:{[h] .huunq.drop each where .huunq.w=h; .huunq.pc h}];
+        .huunq.r[k]:r;
+        .huunq.w[k]:.z.w];
+    (n;b;0#r)}"""
+_EXECUTE_EACH = "{[e;q;mr;mb;w] (value e)[`;;();mr;mb;0b;w] each q}"
+_FETCH = "{[k;i;n] t:.huunq.r k; t i+til 0|n&count[t]-i}"
+_DROP = "{[k] .huunq.drop k;}"
+
+
+def supports_streaming(q_connection: QConnection) -> bool:
+    """Whether results can be kept on the server behind a connection.
+
+    Replicated connections send each request to any of their replicas, so
+    the batches of a result could be fetched from another replica.
+    """
+    from huunq.routing import ReplicaRouter
+
+    return not isinstance(q_connection, ReplicaRouter)
+
+
+class Staged(NamedTuple):
+    key: str
+    rows: int
+    nbytes: int
+    table: pykx.Table
+
+    @property
+    def complete(self) -> bool:
+        """Whether `table` holds the whole result, which is always the case
+        for results that are not tables."""
+        return self.rows < 0 or len(self.table) == self.rows
+
+
+def execute(
+    q_connection: QConnection,
+    operation: str,
+    parameters: Sequence[Any],
+    *,
+    max_rows: int | None,
+    max_bytes: int | None,
+    stream: bool,
+) -> Staged:
+    """Executes a SQL statement, transferring its result only if its
+    estimated size is within the limits.
+
+    The size of the result is estimated on the server from its row count
+    and the types of its columns, see `huunq.sizing`. If the result exceeds
+    the limits, only its schema is transferred, and the result is kept on
+    the server to be fetched with `iter_batches` if `stream` is set.
+
+    Args:
+        q_connection (QConnection): The connection to the server.
+        operation (str): The SQL operation, in the `numeric_dollar`
+            parameter style.
+        parameters (Sequence[Any]): The parameters of the operation.
+        max_rows (int | None): The maximum number of rows, if any.
+        max_bytes (int | None): The maximum estimated size, if any.
+        stream (bool): Whether to keep results over the limits on the server.
+
+    Returns:
+        Staged: The row count and estimated size of the result, along with
+        the result itself if it is within the limits.
+    """
+    key = f"r{uuid.uuid4().hex}"
+    rows, nbytes, table = q_connection(
+        _EXECUTE,
+        key,
+        pykx.CharVector(operation),
+        tuple(parameters),
+        _UNLIMITED if max_rows is None else max_rows,
+        _UNLIMITED if max_bytes is None else max_bytes,
+        stream,
+        _WIDTHS,
+    )
+    return Staged(key, int(rows.py()), int(nbytes.py()), table)
+
+
+def execute_script(
+    q_connection: QConnection,
+    statements: Sequence[str],
+    *,
+    max_rows: int | None,
+    max_bytes: int | None,
+) -> list[Staged]:
+    """Executes several SQL statements in one round trip, transferring
+    each result only if its estimated size is within the limits.
+
+    Args:
+        q_connection (QConnection): The connection to the server.
+        statements (Sequence[str]): The SQL statements, without parameters.
+        max_rows (int | None): The maximum number of rows of each result,
+            if any.
+        max_bytes (int | None): The maximum estimated size of each result,
+            if any.
+
+    Returns:
+        list[Staged]: The row count and estimated size of each result, along
+        with the result itself if it is within the limits.
+    """
+    results = q_connection(
+        _EXECUTE_EACH,
+        pykx.CharVector(_EXECUTE),
+        [pykx.CharVector(statement) for statement in statements],
+        _UNLIMITED if max_rows is None else max_rows,
+        _UNLIMITED if max_bytes is None else max_bytes,
+        _WIDTHS,
+    )
+    return [
+        Staged("", int(rows.py()), int(nbytes.py()), table)
+        for rows, nbytes, table in results
+    ]
+
+
+class BatchSizer:
+    def __init__(
+        self, row_bytes: int, target_bytes: int, target_latency: float
+    ) -> None:
+        """Tunes the number of rows fetched per batch.
+
+        Batches start at `target_bytes` and are halved whenever a batch
+        takes longer than `target_latency` to fetch, then doubled again, up
+        to `target_bytes`, while batches are fetched well within it.
+
+        Args:
+            row_bytes (int): The estimated size of a row, in bytes.
+            target_bytes (int): The maximum estimated size of a batch.
+            target_latency (float): The target time to fetch a batch,
+                in seconds.
+        """
+        self.max_rows = max(1, target_bytes // max(1, row_bytes))
+        self.rows = self.max_rows
+        self.target_latency = target_latency
+
+    def update(self, elapsed: float) -> None:
+        """Adjusts the batch size to the time the last batch took.
+
+        Args:
+            elapsed (float): The time the last batch took, in seconds.
+        """
+        if elapsed > self.target_latency:
+            self.rows = max(1, self.rows // 2)
+        elif elapsed < self.target_latency / 4:
+            self.rows = min(self.max_rows, self.rows * 2)
+
+
+def iter_batches(
+    q_connection: QConnection, staged: Staged, sizer: BatchSizer
+) -> Generator[pykx.Table, None, None]:
+    """Fetches a result kept on the server in batches.
+
+    The result is removed from the server once the generator is exhausted
+    or closed, or when the client disconnects.
+
+    Args:
+        q_connection (QConnection): The connection to the server.
+        staged (Staged): The result kept on the server, see `execute`.
+        sizer (BatchSizer): The sizer of the batches.
+
+    Yields:
+        pykx.Table: The next batch of rows.
+    """
+    try:
+        position = 0
+        while position < staged.rows:
+            start = time.perf_counter()
+            batch = q_connection(_FETCH, staged.key, position, sizer.rows)
+            sizer.update(time.perf_counter() - start)
+            if not len(batch):
+                break
+            position += len(batch)
+            yield batch
+    finally:
+        if not q_connection.closed:
+            q_connection(_DROP, staged.key)
@@ -5,6 +5,7 @@ from typing import Any
 from typing import Literal
 from typing import Mapping
 from typing import Optional
+from typing import Protocol
 from typing import Sequence
 from typing import Tuple
 from typing import Union
@@ -34,3 +35,23 @@ Description: TypeAlias = Optional[
     ]
 ]
 Parameters: TypeAlias = Union[Sequence[Any], Mapping[Union[str, int], Any]]
+RoutingStrategy: TypeAlias = Literal["least_outstanding", "latency"]
+FrameEngine: TypeAlias = Literal["pandas", "polars"]
+LimitAction: TypeAlias = Literal["raise", "stream"]
+
+
+class QConnection(Protocol):
+    """The interface of `pykx.SyncQConnection` used by huunq."""
+
+    @property
+    def closed(self) -> bool:
+        ...
+
+    def __call__(self, query: str | bytes, *args: Any) -> Any:
+        ...
+
+    def sql(self, query: str, *args: Any) -> Any:
+        ...
+
+    def close(self) -> None:
+        ...
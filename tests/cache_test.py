@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+import pykx
+import pytest
+
+from huunq.cache import CacheStats
+from huunq.cache import ResultCache
+from huunq.connection import connect
+from huunq.connection import Connection
+from huunq.cursor import Cursor
+from huunq.typing import Parameters
+
+
+@pytest.fixture
+def table() -> pykx.Table:
+    return pykx.toq(pd.DataFrame({"x": [1.0, 2.0, 3.0], "y": [1, 2, 3]}))
+
+
+def to_rows(table: pykx.Table) -> list[tuple[object, ...]]:
+    raise AssertionError("The rows should not be converted")
+
+
+@pytest.fixture
+def connection(q_server_port: int) -> Iterable[Connection]:
+    connection = connect(port=q_server_port, cache=ResultCache())
+    connection.q_connection(r"\l s.k_")
+    yield connection
+    connection.close()
+
+
+@pytest.mark.parametrize(
+    ("operation", "parameters", "cacheable"),
+    (
+        ("SELECT * FROM t", None, True),
+        ("  select * FROM t WHERE x > :1", [1.0], True),
+        ("SELECT * FROM t WHERE x IN :1", [np.arange(3)], True),
+        ("SELECT * FROM t WHERE x IN :a", {"a": pd.Series([1, 2])}, True),
+        ("SELECT * FROM t WHERE x IN :1", [pykx.toq(np.arange(3))], False),
+        ("SELECT * FROM t WHERE x > :1", [{1, 2}], False),
+        ("DELETE FROM t", None, False),
+    ),
+)
+def test_make_key(
+    operation: str, parameters: Parameters | None, cacheable: bool
+) -> None:
+    key = ResultCache.make_key(operation, parameters)
+    assert (key is not None) == cacheable
+
+
+def test_make_key_arrays() -> None:
+    operation = "SELECT * FROM t WHERE x IN :1"
+    assert ResultCache.make_key(
+        operation, [np.arange(3)]
+    ) == ResultCache.make_key(operation, [np.arange(3)])
+    assert ResultCache.make_key(
+        operation, [np.arange(3)]
+    ) != ResultCache.make_key(operation, [np.arange(4)])
+
+
+def test_make_key_object_arrays() -> None:
+    operation = "SELECT * FROM t WHERE s IN :1"
+    a = ResultCache.make_key(operation, [np.array(["a", "b"], dtype=object)])
+    b = ResultCache.make_key(operation, [np.array(["c", "d"], dtype=object)])
+    assert a != b
+    assert a == ResultCache.make_key(
+        operation, [pd.Series(["a", "b"]).to_numpy()]
+    )
+
+
+def test_make_key_types() -> None:
+    operation = "SELECT * FROM t WHERE x = :1"
+    keys = {
+        ResultCache.make_key(operation, [value])
+        for value in (1, True, 1.0, np.int64(1))
+    }
+    assert len(keys) == 4
+
+
+def test_make_key_endpoint() -> None:
+    operation = "SELECT * FROM t"
+    assert ResultCache.make_key(
+        operation, None, ("a", 5000)
+    ) != ResultCache.make_key(operation, None, ("b", 5000))
+
+
+def test_get_put(table: pykx.Table) -> None:
+    cache = ResultCache()
+    assert cache.get("key") is None
+    cache.put("key", "SELECT * FROM t", table, Cursor.table_to_rows)
+    entry = cache.get("key")
+    assert entry is not None
+    assert entry.table is table
+    assert entry.tables == frozenset({"t"})
+    assert entry.rows == [(1.0, 1), (2.0, 2), (3.0, 3)]
+    assert entry.rows is entry.rows
+    assert cache.stats == CacheStats(
+        hits=1, misses=1, evictions=0, entries=1, nbytes=entry.nbytes
+    )
+
+
+def test_ttl(table: pykx.Table) -> None:
+    cache = ResultCache(ttl=60.0, table_ttls={"u": 0.0})
+    cache.put("t", "SELECT * FROM t", table, to_rows)
+    cache.put("u", "SELECT * FROM t JOIN u ON t.y = u.y", table, to_rows)
+    assert cache.get("t") is not None
+    assert cache.get("u") is None
+    assert cache.stats.entries == 1
+
+
+def test_max_bytes(table: pykx.Table) -> None:
+    cache = ResultCache()
+    cache.put("a", "SELECT * FROM t", table, to_rows)
+    cache.max_bytes = cache.stats.nbytes * 2
+    cache.put("b", "SELECT * FROM t", table, to_rows)
+    assert cache.get("a") is not None
+    cache.put("c", "SELECT * FROM t", table, to_rows)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.stats.evictions == 1
+    cache.max_bytes = 0
+    cache.put("d", "SELECT * FROM t", table, to_rows)
+    assert cache.get("d") is None
+
+
+def test_invalidate(table: pykx.Table) -> None:
+    cache = ResultCache()
+    cache.put("t", "SELECT * FROM t", table, to_rows)
+    cache.put("u", "SELECT * FROM u", table, to_rows)
+    assert cache.invalidate("t") == 1
+    assert cache.get("t") is None
+    assert cache.get("u") is not None
+    assert cache.invalidate() == 1
+    assert cache.stats.entries == cache.stats.nbytes == 0
+
+
+def test_cursor_execute(connection: Connection) -> None:
+    cursor = connection.cursor()
+    results = []
+    for _ in range(2):
+        cursor.execute("SELECT * FROM dummy_table WHERE x > :1", [0.5])
+        assert cursor.fetchone() is not None
+        results.append(cursor.fetchall())
+    assert results[0] == results[1]
+    assert connection.cache is not None
+    assert connection.cache.stats.hits == 1
+    assert connection.cache.stats.misses == 1
+    cursor.close()
+
+
+def test_cursor_executescript_not_cached(connection: Connection) -> None:
+    cursor = Cursor(connection)
+    cursor.executescript("SELECT * FROM dummy_table")
+    assert connection.cache is not None
+    assert connection.cache.stats.entries == 0
+    cursor.close()
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import Iterable
 
 import pytest
 
+import huunq
 from huunq.connection import connect
 from huunq.connection import Connection
 from huunq.cursor import Cursor
@@ -43,3 +45,33 @@ def test_cursor(connection: Connection) -> None:
     cursor = connection.cursor()
     assert isinstance(cursor, Cursor)
     assert cursor.connection == connection
+
+
+def test_clone(connection: Connection) -> None:
+    with connection.clone() as clone:
+        assert clone is not connection
+        assert (clone.host, clone.port) == (connection.host, connection.port)
+        assert not clone.is_closed
+    assert clone.is_closed
+    assert not connection.is_closed
+
+
+def test_threadsafety() -> None:
+    assert huunq.threadsafety == 2
+
+
+def test_shared_between_threads(connection: Connection) -> None:
+    connection.q_connection(r"\l s.k_")
+
+    def run(threshold: float) -> int:
+        cursor = connection.cursor()
+        cursor.execute("SELECT * FROM dummy_table WHERE x > :1", [threshold])
+        rows = len(cursor.fetchall())
+        cursor.close()
+        return rows
+
+    thresholds = [i / 100 for i in range(100)]
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = list(executor.map(run, thresholds))
+    assert results == [run(threshold) for threshold in thresholds]
+    assert results == sorted(results, reverse=True)
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
+from typing import Callable
+from typing import cast
 from typing import Iterable
 
+import numpy as np
+import pandas as pd
+import pykx
 import pytest
 
 from huunq.connection import connect
 from huunq.connection import Connection
 from huunq.cursor import Cursor
 from huunq.exceptions import NotSupportedError
+from huunq.exceptions import ProgrammingError
 from huunq.typing import Parameters
 
 
@@ -162,3 +168,124 @@ def test_setoutputsize(cursor: Cursor) -> None:
 def test_executemany(cursor: Cursor) -> None:
     with pytest.raises(NotSupportedError):
         cursor.executemany("", [])
+
+
+def test_executescript(cursor: Cursor) -> None:
+    cursor.executescript(
+        "SELECT * FROM dummy_table; "
+        "SELECT * FROM dummy_table WHERE x > 2.0; "
+        "SELECT COUNT(*) AS n FROM dummy_table"
+    )
+    assert cursor.rowcount == 500
+    assert len(cursor.fetchall()) == 500
+    assert cursor.nextset() is True
+    assert cursor.fetchall() == []
+    assert cursor.nextset() is True
+    assert cursor.description == (("n", None, None, None, None, None, None),)
+    assert cursor.fetchall() == [(500,)]
+    assert cursor.nextset() is None
+
+
+def test_executescript_empty(cursor: Cursor) -> None:
+    cursor.executescript(" ; ")
+    assert cursor.result_set is None
+    assert cursor.nextset() is None
+
+
+def test_nextset_after_execute(cursor: Cursor) -> None:
+    cursor.execute("SELECT * FROM dummy_table")
+    assert cursor.nextset() is None
+    assert cursor.rowcount == 500
+
+
+@pytest.mark.parametrize(
+    ("to_parameter",),
+    (
+        (lambda symbols: np.array(symbols, dtype=object),),
+        (lambda symbols: pd.Series(symbols, dtype=object),),
+        (lambda symbols: pykx.SymbolVector(symbols),),
+    ),
+)
+def test_execute_vector_parameter(
+    cursor: Cursor, to_parameter: Callable[[list[str]], object]
+) -> None:
+    cursor.execute("SELECT x1 FROM dummy_table")
+    symbols = [cast(str, row[0]) for row in cursor.fetchmany(3)]
+    cursor.execute(
+        "SELECT x1 FROM dummy_table WHERE x1 IN :1", [to_parameter(symbols)]
+    )
+    results = cursor.fetchall()
+    assert len(results) >= 3
+    assert {row[0] for row in results} == set(symbols)
+
+
+@pytest.mark.parametrize(
+    ("parameters", "expected_rows"),
+    (
+        (None, 500),
+        ([2.0], 0),
+    ),
+)
+@pytest.mark.parametrize(("connections",), ((1,), (4,)))
+def test_execute_partitioned(
+    cursor: Cursor,
+    parameters: Parameters | None,
+    expected_rows: int,
+    connections: int,
+) -> None:
+    operation = "SELECT * FROM dummy_table"
+    if parameters is not None:
+        operation += " WHERE x > :1"
+    cursor.execute_partitioned(
+        operation,
+        parameters,
+        partition_column="x",
+        ranges=[(0.0, 0.25), (0.25, 0.5), (0.5, 0.75), (0.75, 1.0)],
+        connections=connections,
+    )
+    assert cursor.rowcount == -1
+    assert cursor.description == (
+        ("x", None, None, None, None, None, None),
+        ("x1", None, None, None, None, None, None),
+        ("x2", None, None, None, None, None, None),
+    )
+    results = cursor.fetchall()
+    assert len(results) == expected_rows == cursor.rowcount
+    buckets = [int(cast(float, row[0]) * 4) for row in results]
+    assert buckets == sorted(buckets)
+
+
+def test_execute_partitioned_fetchmany(cursor: Cursor) -> None:
+    cursor.execute_partitioned(
+        "SELECT * FROM dummy_table",
+        partition_column="x",
+        ranges=[(0.0, 0.5), (0.5, 1.0)],
+    )
+    fetched = 0
+    while results := cursor.fetchmany(100):
+        fetched += len(results)
+    assert fetched == 500 == cursor.rowcount
+
+
+def test_execute_partitioned_fetchtables(cursor: Cursor) -> None:
+    cursor.execute_partitioned(
+        "SELECT * FROM dummy_table",
+        partition_column="x",
+        ranges=[(0.0, 0.5), (0.5, 1.0)],
+    )
+    tables = list(cursor.fetchtables())
+    assert len(tables) == 2
+    assert sum(len(table) for table in tables) == 500
+
+
+def test_execute_partitioned_no_ranges(cursor: Cursor) -> None:
+    with pytest.raises(ProgrammingError):
+        cursor.execute_partitioned(
+            "SELECT * FROM dummy_table", partition_column="x", ranges=[]
+        )
+
+
+def test_fetchtables_invalid_size(cursor: Cursor) -> None:
+    cursor.execute("SELECT * FROM dummy_table")
+    with pytest.raises(ProgrammingError):
+        next(cursor.fetchtables(0))
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+import pandas as pd
+import pytest
+
+from huunq.connection import connect
+from huunq.connection import Connection
+from huunq.exceptions import ProgrammingError
+from huunq.frames import read_frame
+
+
+@pytest.fixture
+def connection(q_server_port: int) -> Iterable[Connection]:
+    connection = connect(port=q_server_port)
+    connection.q_connection(r"\l s.k_")
+    yield connection
+    connection.close()
+
+
+def test_read_frame(connection: Connection) -> None:
+    frame = read_frame(connection, "SELECT * FROM dummy_table")
+    assert isinstance(frame, pd.DataFrame)
+    assert list(frame.columns) == ["x", "x1", "x2"]
+    assert len(frame) == 500
+
+
+def test_read_frame_parameters(connection: Connection) -> None:
+    frame = read_frame(
+        connection, "SELECT * FROM dummy_table WHERE x > :1", [2.0]
+    )
+    assert isinstance(frame, pd.DataFrame)
+    assert list(frame.columns) == ["x", "x1", "x2"]
+    assert len(frame) == 0
+
+
+def test_read_frame_chunksize_empty(connection: Connection) -> None:
+    chunks = list(
+        read_frame(
+            connection,
+            "SELECT * FROM dummy_table WHERE x > :1",
+            [2.0],
+            chunksize=10,
+        )
+    )
+    assert len(chunks) == 1
+    assert list(chunks[0].columns) == ["x", "x1", "x2"]
+    assert len(chunks[0]) == 0
+
+
+@pytest.mark.parametrize(("chunksize",), ((1,), (128,), (500,), (1000,)))
+def test_read_frame_chunksize(connection: Connection, chunksize: int) -> None:
+    chunks = list(
+        read_frame(
+            connection, "SELECT * FROM dummy_table", chunksize=chunksize
+        )
+    )
+    assert all(isinstance(chunk, pd.DataFrame) for chunk in chunks)
+    assert all(len(chunk) <= chunksize for chunk in chunks)
+    assert len(chunks) == -(-500 // chunksize)
+    assert pd.concat(chunks, ignore_index=True).equals(
+        read_frame(connection, "SELECT * FROM dummy_table")
+    )
+
+
+def test_read_frame_polars(connection: Connection) -> None:
+    pl = pytest.importorskip("polars")
+    frame = read_frame(
+        connection, "SELECT * FROM dummy_table", engine="polars"
+    )
+    assert isinstance(frame, pl.DataFrame)
+    assert frame.columns == ["x", "x1", "x2"]
+    assert frame.height == 500
+
+
+def test_read_frame_invalid_engine(connection: Connection) -> None:
+    with pytest.raises(ProgrammingError):
+        read_frame(  # type: ignore[call-overload]
+            connection, "SELECT * FROM dummy_table", engine="numpy"
+        )
+
+
+def test_read_frame_invalid_chunksize(connection: Connection) -> None:
+    with pytest.raises(ProgrammingError):
+        read_frame(connection, "SELECT * FROM dummy_table", chunksize=0)
+
+
+def test_read_frame_chunksize_streamed(connection: Connection) -> None:
+    chunks = read_frame(connection, "SELECT * FROM dummy_table", chunksize=64)
+    next(chunks)
+    staged = connection.q_connection("count @[get;`.huunq.r;()]")
+    assert staged.py() == 1
+    assert sum(len(chunk) for chunk in chunks) == 500 - 64
+    staged = connection.q_connection("count @[get;`.huunq.r;()]")
+    assert staged.py() == 0
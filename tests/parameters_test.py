@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pykx
+import pytest
+
+from huunq.exceptions import ProgrammingError
+from huunq.parameters import to_q_parameter
+
+
+@pytest.mark.parametrize(
+    ("value", "expected_type"),
+    (
+        (np.array([True, False]), pykx.BooleanVector),
+        (np.arange(3, dtype=np.int32), pykx.IntVector),
+        (np.arange(3, dtype=np.int64), pykx.LongVector),
+        (np.linspace(0.0, 1.0, 3), pykx.FloatVector),
+        (
+            np.array(["2024-01-01"], dtype="datetime64[D]"),
+            pykx.DateVector,
+        ),
+        (
+            np.array(["2024-01-01"], dtype="datetime64[ns]"),
+            pykx.TimestampVector,
+        ),
+        (np.array(["a", "b"], dtype=object), pykx.SymbolVector),
+        (pd.Series([1.0, 2.0]), pykx.FloatVector),
+        (pd.Index([1, 2]), pykx.LongVector),
+    ),
+)
+def test_to_q_parameter_vector(
+    value: object, expected_type: type[pykx.K]
+) -> None:
+    assert isinstance(to_q_parameter(value), expected_type)
+
+
+def test_to_q_parameter_non_contiguous() -> None:
+    value = to_q_parameter(np.arange(10)[::2])
+    assert isinstance(value, pykx.LongVector)
+    assert value.py() == [0, 2, 4, 6, 8]
+
+
+@pytest.mark.parametrize("box", (pd.Series, pd.DatetimeIndex))
+def test_to_q_parameter_timezone(box: type) -> None:
+    times = pd.date_range("2024-01-01", periods=2, freq="h", tz="Etc/GMT-1")
+    value = to_q_parameter(box(times))
+    assert isinstance(value, pykx.TimestampVector)
+    assert list(value.np()) == [
+        np.datetime64("2023-12-31T23:00", "ns"),
+        np.datetime64("2024-01-01T00:00", "ns"),
+    ]
+
+
+def test_to_q_parameter_pykx_passthrough() -> None:
+    vector = pykx.toq(np.arange(3))
+    assert to_q_parameter(vector) is vector
+
+
+@pytest.mark.parametrize(("value",), ((1.0,), ("abc",), ([1, 2],)))
+def test_to_q_parameter_passthrough(value: object) -> None:
+    assert to_q_parameter(value) is value
+
+
+def test_to_q_parameter_multidimensional() -> None:
+    with pytest.raises(ProgrammingError, match=r"one-dimensional"):
+        to_q_parameter(np.zeros((2, 2)))
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterable
+
+import pytest
+
+from huunq.cache import ResultCache
+from huunq.connection import connect
+from huunq.connection import Connection
+from huunq.profile import main
+from huunq.profile import Profiler
+from huunq.profile import STAGES
+
+
+@pytest.fixture
+def connection(q_server_port: int) -> Iterable[Connection]:
+    connection = connect(port=q_server_port)
+    connection.q_connection(r"\l s.k_")
+    yield connection
+    connection.close()
+
+
+@pytest.mark.parametrize(
+    ("operation", "parameters", "rows"),
+    (
+        ("SELECT * FROM dummy_table", None, 500),
+        ("SELECT * FROM dummy_table WHERE x > :1", [2.0], 0),
+    ),
+)
+def test_profiler(
+    connection: Connection,
+    operation: str,
+    parameters: list[object] | None,
+    rows: int,
+) -> None:
+    profiler = Profiler(connection, operation, parameters)
+    profiler.run(3)
+    assert profiler.rows == rows
+    assert profiler.peak_memory > 0
+    for stage in STAGES:
+        assert len(profiler.timings[stage]) == 3
+        assert all(timing >= 0 for timing in profiler.timings[stage])
+    report = profiler.report()
+    assert all(stage in report for stage in (*STAGES, "total"))
+
+
+def test_profiler_streamed(connection: Connection) -> None:
+    profiler = Profiler(
+        connection,
+        "SELECT * FROM dummy_table",
+        max_rows=100,
+        on_limit="stream",
+    )
+    profiler.run(2)
+    assert profiler.rows == 500
+    assert all(timing > 0 for timing in profiler.timings["rows"])
+
+
+def test_profiler_cached(q_server_port: int) -> None:
+    with connect(port=q_server_port, cache=ResultCache()) as connection:
+        connection.q_connection(r"\l s.k_")
+        profiler = Profiler(connection, "SELECT * FROM dummy_table")
+        profiler.run(3)
+    assert profiler.rows == 500
+    assert connection.cache is not None
+    assert connection.cache.stats.hits == 3
+    assert profiler.timings["server"][1:] == [0.0, 0.0]
+
+
+def test_main(
+    connection: Connection,
+    q_server_port: int,
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    cprofile = tmp_path / "client.prof"
+    flamegraph = tmp_path / "client.folded"
+    exit_code = main(
+        [
+            "--port",
+            str(q_server_port),
+            "-n",
+            "2",
+            "--cprofile",
+            str(cprofile),
+            "--flamegraph",
+            str(flamegraph),
+            "SELECT * FROM dummy_table WHERE x > :1",
+            "0.5",
+        ]
+    )
+    assert exit_code == 0
+    assert "peak memory" in capsys.readouterr().out
+    assert cprofile.stat().st_size > 0
+    assert flamegraph.exists()
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import socket
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable
+
+import pykx
+import pytest
+
+from huunq.exceptions import InterfaceError
+from huunq.exceptions import OperationalError
+from huunq.routing import connect_replicas
+from huunq.routing import ReplicatedConnection
+from huunq.typing import RoutingStrategy
+
+
+@pytest.fixture
+def dead_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("", 0))
+        _, port, *_ = s.getsockname()
+        assert isinstance(port, int)
+        return port
+
+
+@pytest.fixture(params=("least_outstanding", "latency"))
+def connection(
+    request: pytest.FixtureRequest, q_server_port: int, dead_port: int
+) -> Iterable[ReplicatedConnection]:
+    strategy: RoutingStrategy = request.param
+    connection = connect_replicas(
+        [
+            ("localhost", q_server_port),
+            ("localhost", q_server_port),
+            ("localhost", dead_port),
+        ],
+        strategy=strategy,
+    )
+    connection.q_connection(r"\l s.k_")
+    yield connection
+    connection.close()
+
+
+def test_routing(connection: ReplicatedConnection) -> None:
+    cursor = connection.cursor()
+    for _ in range(20):
+        cursor.execute("SELECT * FROM dummy_table")
+        assert len(cursor.fetchall()) == 500
+    cursor.close()
+    live, other, dead = connection.replica_stats
+    assert live.available and other.available
+    assert live.requests > 0 and other.requests > 0
+    assert live.latency is not None and other.latency is not None
+    assert not dead.available
+    assert dead.failures == 1
+    assert dead.requests == 0
+
+
+def test_q_error_does_not_eject(connection: ReplicatedConnection) -> None:
+    with pytest.raises(pykx.QError):
+        connection.q_connection("'oops")
+    assert all(stats.failures == 0 for stats in connection.replica_stats[:2])
+
+
+def test_dead_replica_probed_again(q_server_port: int, dead_port: int) -> None:
+    connection = connect_replicas(
+        [("localhost", q_server_port), ("localhost", dead_port)],
+        eject_for=0.0,
+    )
+    connection.q_connection(r"\l s.k_")
+    cursor = connection.cursor()
+    for _ in range(3):
+        cursor.execute("SELECT * FROM dummy_table")
+        assert len(cursor.fetchall()) == 500
+    cursor.close()
+    _, dead = connection.replica_stats
+    assert dead.requests > 0
+    assert dead.failures == dead.requests + 1
+    connection.close()
+
+
+def test_slow_ejection_keeps_requests_in_flight(q_server_port: int) -> None:
+    connection = connect_replicas(
+        [("localhost", q_server_port), ("localhost", q_server_port)],
+        slow_after=1e-9,
+        eject_for=0.01,
+    )
+    connection.q_connection(r"\l s.k_")
+
+    def run(_: int) -> int:
+        cursor = connection.cursor()
+        cursor.execute("SELECT * FROM dummy_table")
+        rows = len(cursor.fetchall())
+        cursor.close()
+        return rows
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        assert set(executor.map(run, range(50))) == {500}
+    stats = connection.replica_stats
+    assert sum(replica.requests for replica in stats) == 51
+    assert sum(replica.failures for replica in stats) > 0
+    connection.close()
+
+
+def test_clone(connection: ReplicatedConnection) -> None:
+    with connection.clone() as clone:
+        assert isinstance(clone, ReplicatedConnection)
+        assert clone.endpoints == connection.endpoints
+
+
+def test_close(connection: ReplicatedConnection) -> None:
+    connection.close()
+    assert connection.is_closed
+    with pytest.raises(InterfaceError):
+        connection.q_connection("1+1")
+
+
+def test_no_endpoints() -> None:
+    with pytest.raises(InterfaceError):
+        connect_replicas([])
+
+
+def test_no_reachable_replica(dead_port: int) -> None:
+    with pytest.raises(OperationalError):
+        connect_replicas([("localhost", dead_port)])
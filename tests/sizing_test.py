@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import pandas as pd
+import pykx
+import pytest
+
+from huunq.sizing import DEFAULT_TYPE_SIZE
+from huunq.sizing import estimate_row_bytes
+from huunq.sizing import estimate_rows_bytes
+from huunq.sizing import estimate_table_bytes
+
+
+@pytest.mark.parametrize(
+    ("types", "expected"),
+    (
+        ([], 0),
+        ([7, 9], 16),
+        ([-7, 1, 14], 13),
+        ([0], DEFAULT_TYPE_SIZE),
+    ),
+)
+def test_estimate_row_bytes(types: list[int], expected: int) -> None:
+    assert estimate_row_bytes(types) == expected
+
+
+def test_estimate_table_bytes() -> None:
+    table = pykx.toq(pd.DataFrame({"x": [1.0, 2.0, 3.0], "y": [1, 2, 3]}))
+    assert estimate_table_bytes(table) == 3 * 16
+
+
+def test_estimate_rows_bytes() -> None:
+    table = pykx.toq(pd.DataFrame({"x": [1.0, 2.0, 3.0], "y": [1, 2, 3]}))
+    assert estimate_rows_bytes(table) == 3 * (40 + 2 * 40)
+    assert estimate_rows_bytes(pykx.toq(pd.DataFrame({"x": []}))) == 0
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import pytest
+
+from huunq.exceptions import ProgrammingError
+from huunq.statements import add_predicate
+from huunq.statements import referenced_tables
+from huunq.statements import split_statements
+
+
+@pytest.mark.parametrize(
+    ("script", "expected"),
+    (
+        ("", []),
+        (" ; ;", []),
+        ("SELECT * FROM t", ["SELECT * FROM t"]),
+        ("SELECT 1; SELECT 2;", ["SELECT 1", "SELECT 2"]),
+        ("SELECT 'a;b' FROM t; SELECT 2", ["SELECT 'a;b' FROM t", "SELECT 2"]),
+        ("SELECT 'it''s;' FROM t", ["SELECT 'it''s;' FROM t"]),
+        ('SELECT "a;b" FROM t', ['SELECT "a;b" FROM t']),
+        ("SELECT 1 /* ; */", ["SELECT 1 /* ; */"]),
+        ("SELECT 1 -- ;\n", ["SELECT 1 -- ;"]),
+        ("SELECT 1; -- done", ["SELECT 1"]),
+        ("/* a */ ; SELECT 'b'; -- c\n/* d */", ["SELECT 'b'"]),
+    ),
+)
+def test_split_statements(script: str, expected: list[str]) -> None:
+    assert split_statements(script) == expected
+
+
+@pytest.mark.parametrize(
+    ("operation", "expected"),
+    (
+        ("SELECT * FROM t", "SELECT * FROM t WHERE p"),
+        ("SELECT * FROM t;", "SELECT * FROM t WHERE p"),
+        (
+            "SELECT * FROM t WHERE x > $1 OR y < 2",
+            "SELECT * FROM t WHERE p AND (x > $1 OR y < 2)",
+        ),
+        (
+            "SELECT s, MAX(x) FROM t WHERE x > 0 GROUP BY s LIMIT 5",
+            "SELECT s, MAX(x) FROM t WHERE p AND (x > 0) GROUP BY s LIMIT 5",
+        ),
+        (
+            "SELECT s FROM t ORDER BY s",
+            "SELECT s FROM t WHERE p ORDER BY s",
+        ),
+        (
+            "SELECT * FROM t WHERE s = 'group by'",
+            "SELECT * FROM t WHERE p AND (s = 'group by')",
+        ),
+        (
+            "SELECT * FROM t WHERE x > 1 -- note",
+            "SELECT * FROM t WHERE p AND (x > 1) -- note",
+        ),
+        (
+            "SELECT * FROM t WHERE x > 1 -- note\nORDER BY x",
+            "SELECT * FROM t WHERE p AND (x > 1) -- note\nORDER BY x",
+        ),
+        (
+            "SELECT * FROM t /* all */ ORDER BY x",
+            "SELECT * FROM t WHERE p /* all */ ORDER BY x",
+        ),
+        (
+            "SELECT * FROM t -- note",
+            "SELECT * FROM t WHERE p -- note",
+        ),
+        (
+            "SELECT * FROM (SELECT * FROM t WHERE x > 0)",
+            "SELECT * FROM (SELECT * FROM t WHERE x > 0) WHERE p",
+        ),
+    ),
+)
+def test_add_predicate(operation: str, expected: str) -> None:
+    assert add_predicate(operation, "p") == expected
+
+
+@pytest.mark.parametrize(
+    ("operation",),
+    (
+        ("DELETE FROM t",),
+        ("SELECT * FROM t; SELECT * FROM u",),
+    ),
+)
+def test_add_predicate_not_a_select(operation: str) -> None:
+    with pytest.raises(ProgrammingError):
+        add_predicate(operation, "p")
+
+
+@pytest.mark.parametrize(
+    ("operation", "expected"),
+    (
+        ("SELECT 1", set()),
+        ("SELECT * FROM t", {"t"}),
+        ("select * from t join u on t.x = u.x", {"t", "u"}),
+        ('SELECT * FROM "my table"', {"my table"}),
+        ("SELECT * FROM .hdb.trades WHERE s = 'from x'", {".hdb.trades"}),
+        ("SELECT * FROM t WHERE x IN (SELECT x FROM u)", {"t", "u"}),
+        ("SELECT * FROM t, u WHERE t.x = u.x", {"t", "u"}),
+        (
+            'SELECT * FROM t AS a, u b, "v w" WHERE a.x = b.x',
+            {"t", "u", "v w"},
+        ),
+        ("SELECT * FROM (SELECT * FROM t) s, u", {"t", "u"}),
+        ("SELECT * FROM t WHERE x = 1, 2", {"t"}),
+    ),
+)
+def test_referenced_tables(operation: str, expected: set[str]) -> None:
+    assert referenced_tables(operation) == expected
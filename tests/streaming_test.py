@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+import pytest
+
+from huunq.cache import ResultCache
+from huunq.connection import connect
+from huunq.connection import Connection
+from huunq.cursor import Cursor
+from huunq.exceptions import NotSupportedError
+from huunq.exceptions import OperationalError
+from huunq.streaming import BatchSizer
+
+# dummy_table has 500 rows of a float, a symbol and a guid.
+ROW_BYTES = 8 + 8 + 16
+
+
+def staged_results(connection: Connection) -> int:
+    count = connection.q_connection("count @[get;`.huunq.r;()]")
+    assert isinstance(count.py(), int)
+    return count.py()  # type: ignore[no-any-return]
+
+
+@pytest.fixture
+def connection(q_server_port: int) -> Iterable[Connection]:
+    connection = connect(port=q_server_port)
+    connection.q_connection(r"\l s.k_")
+    yield connection
+    connection.close()
+
+
+@pytest.fixture
+def cursor(connection: Connection) -> Iterable[Cursor]:
+    cursor = connection.cursor()
+    yield cursor
+    cursor.close()
+
+
+def test_batch_sizer() -> None:
+    sizer = BatchSizer(row_bytes=10, target_bytes=1000, target_latency=1.0)
+    assert sizer.rows == sizer.max_rows == 100
+    sizer.update(2.0)
+    assert sizer.rows == 50
+    sizer.update(0.5)
+    assert sizer.rows == 50
+    sizer.update(0.1)
+    assert sizer.rows == 100
+    sizer.update(0.1)
+    assert sizer.rows == 100
+
+
+def test_batch_sizer_minimum() -> None:
+    sizer = BatchSizer(row_bytes=2000, target_bytes=1000, target_latency=1.0)
+    assert sizer.rows == 1
+    sizer.update(2.0)
+    assert sizer.rows == 1
+
+
+@pytest.mark.parametrize(
+    ("max_rows", "max_result_bytes"),
+    ((500, None), (None, 500 * ROW_BYTES), (1000, 10**6)),
+)
+def test_execute_within_limits(
+    cursor: Cursor, max_rows: int | None, max_result_bytes: int | None
+) -> None:
+    cursor.max_rows = max_rows
+    cursor.max_result_bytes = max_result_bytes
+    cursor.execute("SELECT * FROM dummy_table")
+    assert cursor.rowcount == 500
+    assert cursor.estimated_bytes == 500 * ROW_BYTES
+    assert len(cursor.fetchall()) == 500
+
+
+@pytest.mark.parametrize(
+    ("max_rows", "max_result_bytes"),
+    ((499, None), (None, 500 * ROW_BYTES - 1)),
+)
+def test_execute_over_limits(
+    cursor: Cursor, max_rows: int | None, max_result_bytes: int | None
+) -> None:
+    cursor.max_rows = max_rows
+    cursor.max_result_bytes = max_result_bytes
+    with pytest.raises(OperationalError, match="500 rows"):
+        cursor.execute("SELECT * FROM dummy_table")
+
+
+def test_execute_stream(connection: Connection, cursor: Cursor) -> None:
+    cursor.max_rows = 100
+    cursor.on_limit = "stream"
+    cursor.fetch_bytes = 64 * ROW_BYTES
+    cursor.execute("SELECT * FROM dummy_table WHERE x > :1", [0.0])
+    assert cursor.rowcount == 500
+    tables = list(cursor.fetchtables())
+    assert [len(table) for table in tables] == [64] * 7 + [52]
+    assert cursor.rowcount == 500
+    assert staged_results(connection) == 0
+
+
+def test_execute_stream_rows(cursor: Cursor) -> None:
+    cursor.max_result_bytes = ROW_BYTES
+    cursor.on_limit = "stream"
+    cursor.fetch_bytes = 100 * ROW_BYTES
+    cursor.execute("SELECT * FROM dummy_table")
+    first = cursor.fetchone()
+    assert first is not None
+    rows = [first, *cursor.fetchmany(150), *cursor.fetchall()]
+    assert len(rows) == 500
+
+
+def test_execute_stream_closed_early(
+    connection: Connection, cursor: Cursor
+) -> None:
+    cursor.max_rows = 0
+    cursor.on_limit = "stream"
+    cursor.execute("SELECT * FROM dummy_table")
+    cursor.fetchone()
+    cursor.execute("SELECT * FROM dummy_table WHERE x > :1", [2.0])
+    assert cursor.rowcount == 0
+    assert staged_results(connection) == 0
+
+
+def test_execute_cached_over_limits(q_server_port: int) -> None:
+    with connect(port=q_server_port, cache=ResultCache()) as connection:
+        connection.q_connection(r"\l s.k_")
+        cursor = connection.cursor()
+        cursor.execute("SELECT * FROM dummy_table")
+        cursor.max_rows = 100
+        with pytest.raises(OperationalError, match="500 rows"):
+            cursor.execute("SELECT * FROM dummy_table")
+        assert cursor.estimated_bytes == 500 * ROW_BYTES
+        cursor.on_limit = "stream"
+        cursor.execute("SELECT * FROM dummy_table")
+        assert len(cursor.fetchmany(10)) == 10
+        assert cursor.rowcount == 500
+        assert connection.cache is not None
+        assert connection.cache.stats.hits == 2
+
+
+def test_executescript_limits(cursor: Cursor) -> None:
+    cursor.max_rows = 500
+    cursor.executescript(
+        "SELECT * FROM dummy_table; SELECT x FROM dummy_table WHERE x > 2"
+    )
+    assert cursor.rowcount == 500
+    assert cursor.nextset()
+    assert cursor.rowcount == 0
+    cursor.max_rows = 499
+    with pytest.raises(OperationalError, match="500 rows"):
+        cursor.executescript("SELECT 1; SELECT * FROM dummy_table")
+
+
+def test_executescript_stream_not_supported(cursor: Cursor) -> None:
+    cursor.max_rows = 10
+    cursor.on_limit = "stream"
+    with pytest.raises(NotSupportedError):
+        cursor.executescript("SELECT * FROM dummy_table")
+
+
+def test_execute_partitioned_limits_not_supported(cursor: Cursor) -> None:
+    cursor.max_rows = 10
+    with pytest.raises(NotSupportedError):
+        cursor.execute_partitioned(
+            "SELECT * FROM dummy_table",
+            partition_column="x",
+            ranges=[(0.0, 1.0)],
+        )
+
+
+def test_staged_results_dropped_on_disconnect(
+    q_server_port: int, connection: Connection
+) -> None:
+    with connect(port=q_server_port) as other:
+        other.q_connection(r"\l s.k_")
+        cursor = other.cursor()
+        cursor.max_rows = 0
+        cursor.on_limit = "stream"
+        cursor.execute("SELECT * FROM dummy_table")
+        assert staged_results(connection) == 1
+    assert staged_results(connection) == 0
+
+
+def test_execute_not_a_table(connection: Connection, cursor: Cursor) -> None:
+    connection.q_connection("limited:([]x:1 2 3)")
+    cursor.max_rows = 1
+    cursor.execute("INSERT INTO limited (x) VALUES (4)")
+    cursor.execute("SELECT * FROM limited WHERE x > 3")
+    assert cursor.fetchall() == [(4,)]